@@ -9,8 +9,11 @@
     """,
     'author': 'Your Company',
     'website': 'https://yourwebsite.com',
-    'depends': ['sale', 'product', 'accountant', 'sale_management', 'stock'],
+    'depends': ['sale', 'product', 'accountant', 'sale_management', 'stock', 'sale_stock'],
     'data': [
+        'security/ir.model.access.csv',
+        'security/docx_conversion_job_security.xml',
+        'data/docx_conversion_cron.xml',
         'views/sale_order_views.xml',
         'views/product_views.xml',
         'views/pricelist_views.xml',
@@ -30,7 +33,7 @@
     ],
     'assets': {
         'web.assets_backend': [
-            'static/src/js/docx_report_handler.js',
+            'bd_calling_billing_management/static/src/js/docx_report_handler.js',
         ],
     },
     'external_dependencies': {
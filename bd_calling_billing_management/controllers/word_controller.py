@@ -1,8 +1,10 @@
-from odoo.http import Controller, route, request
+from odoo.http import Controller, route, request, content_disposition
 import json
 import logging
 import io
 
+from odoo.addons.bd_calling_billing_management.models.docx_conversion_job import DOCX_MIMETYPE
+
 _logger = logging.getLogger(__name__)
 
 
@@ -45,8 +47,7 @@ class DocxPdfConverterController(Controller):
             return request.make_response(
                 docx_bytes,
                 headers=[
-                    ('Content-Type',
-                     'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+                    ('Content-Type', DOCX_MIMETYPE),
                     ('Content-Disposition', f'attachment; filename="{filename}"')
                 ]
             )
@@ -55,6 +56,67 @@ class DocxPdfConverterController(Controller):
             _logger.error("DOCX conversion crash: %s", e)
             return self._normal_download(data, context, token)
 
+    # --------------------------------------------------------------------------
+    # Background conversion: enqueue, poll, download
+    @route(['/report/docx/enqueue'], type='json', auth="user")
+    def report_docx_enqueue(self, report_name, docids, data=None, context=None):
+        """Queue a DOCX conversion and return the job id immediately"""
+        if isinstance(docids, str):
+            docids = [int(docid) for docid in docids.split(',') if docid]
+        env = request.env
+        if context:
+            env = env(context=dict(env.context, **context))
+        job = env['docx.conversion.job']._enqueue(report_name, docids, data=data)
+        return {'job_id': job.id}
+
+    @route(['/report/docx/status/<int:job_id>'], type='json', auth="user")
+    def report_docx_status(self, job_id):
+        """Return the state of a conversion job started by the current user"""
+        job = self._get_user_job(job_id)
+        if not job:
+            return {'state': 'failed', 'error': 'Conversion job not found'}
+        return {
+            'state': job.state,
+            'error': job.error_message or '',
+            'download_url': f'/report/docx/download/{job.id}' if job.state == 'done' else False,
+        }
+
+    @route(['/report/docx/download/<int:job_id>'], type='http', auth="user")
+    def report_docx_download(self, job_id):
+        """Download the DOCX produced by a finished conversion job"""
+        job = self._get_user_job(job_id)
+        if not job or job.state != 'done' or not job.attachment_id:
+            return request.not_found()
+        stream = request.env['ir.binary']._get_stream_from(job.attachment_id.sudo())
+        return stream.get_response(as_attachment=True)
+
+    @route([
+        '/report/docx/native/<string:report_name>',
+        '/report/docx/native/<string:report_name>/<string:docids>',
+    ], type='http', auth="user")
+    def report_docx_native(self, report_name, docids=None, data=None):
+        """Render a 'docx' report directly with its python-docx builder"""
+        Report = request.env['ir.actions.report']
+        report = Report._get_report(report_name)
+        # Reports printed from data only (e.g. wizards) come without docids
+        res_ids = [int(docid) for docid in docids.split(',') if docid] if docids else []
+        docx_bytes, _content_type = Report._render(report, res_ids, data=json.loads(data) if data else None)
+        filename = request.env['docx.conversion.job']._get_docx_filename(report, res_ids)
+        return request.make_response(
+            docx_bytes,
+            headers=[
+                ('Content-Type', DOCX_MIMETYPE),
+                ('Content-Length', len(docx_bytes)),
+                ('Content-Disposition', content_disposition(filename)),
+            ]
+        )
+
+    def _get_user_job(self, job_id):
+        job = request.env['docx.conversion.job'].sudo().browse(job_id).exists()
+        if job and job.create_uid.id != request.env.user.id:
+            return None
+        return job
+
     # --------------------------------------------------------------------------
     # 🚀 NEW: Check if report should be converted to DOCX
     def _should_convert_to_docx(self, report_id):
@@ -100,168 +162,8 @@ class DocxPdfConverterController(Controller):
             return None
 
     # --------------------------------------------------------------------------
-    # ✅ PDF → DOCX with OPTION 2: Extract totals from bottom-right area
     def _convert_pdf_to_docx(self, pdf_data):
-        import io, tempfile, os, fitz, hashlib
-        from PIL import Image
-        from pdf2docx import Converter
-        from docx import Document
-        from docx.shared import Inches, Pt, RGBColor
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-
-        try:
-            # -----------------------------
-            # Step 1: PDF → DOCX with table parsing
-            # -----------------------------
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_pdf, \
-                tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as tmp_docx:
-
-                tmp_pdf.write(pdf_data)
-                tmp_pdf.flush()
-
-                cv = Converter(tmp_pdf.name)
-                cv.convert(
-                    tmp_docx.name,
-                    start=0,
-                    end=None,
-                    parse_table=True,           # ✅ Enable to get table data
-                    detect_vertical=False,      
-                    detect_horizontal=False,    
-                    images=False                # images handled manually later
-                )
-                cv.close()
-
-                docx_bytes = open(tmp_docx.name, "rb").read()
-
-                try:
-                    os.unlink(tmp_pdf.name)
-                    os.unlink(tmp_docx.name)
-                except:
-                    pass
-
-            # Load DOCX
-            doc = Document(io.BytesIO(docx_bytes))
-            pdf = fitz.open(stream=pdf_data, filetype="pdf")
-            added_hashes = set()
-
-            # -----------------------------
-            # Step 2: Extract totals from bottom-right of each page
-            # -----------------------------
-            for page_index, page in enumerate(pdf):
-                page_width = page.rect.width
-                page_height = page.rect.height
-                
-                # 🚀 OPTION 2: Extract text from bottom-right corner (where totals are)
-                # Define the area: right 40% of page, bottom 20% of page
-                totals_rect = fitz.Rect(
-                    page_width * 0.60,  # Start from 60% right
-                    page_height * 0.75,  # Start from 75% down
-                    page_width,          # To right edge
-                    page_height          # To bottom edge
-                )
-                
-                # Extract text from this area
-                totals_text = page.get_text("text", clip=totals_rect).strip()
-                
-                # If we found totals text, add it to the document
-                if totals_text and any(keyword in totals_text.lower() 
-                                      for keyword in ['subtotal', 'tax', 'total', 'amount']):
-                    _logger.info("Found totals section: %s", totals_text[:100])
-                    
-                    # Add spacing before totals
-                    doc.add_paragraph()
-                    
-                    # Create a right-aligned paragraph for totals
-                    totals_paragraph = doc.add_paragraph()
-                    totals_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                    
-                    # Add the totals text with formatting
-                    run = totals_paragraph.add_run(totals_text)
-                    run.font.size = Pt(10)
-                    run.font.name = 'Arial'
-                    
-                    # Make "Total:" line bold if present
-                    if 'Total:' in totals_text or 'total:' in totals_text:
-                        lines = totals_text.split('\n')
-                        totals_paragraph.clear()
-                        
-                        for line in lines:
-                            if line.strip():
-                                run = totals_paragraph.add_run(line + '\n')
-                                run.font.size = Pt(10)
-                                run.font.name = 'Arial'
-                                
-                                # Bold the Total line
-                                if 'total:' in line.lower():
-                                    run.font.bold = True
-
-            # -----------------------------
-            # Step 3: Add images manually (skip watermarks)
-            # -----------------------------
-            for page_index, page in enumerate(pdf):
-                images = page.get_images(full=True)
-                page_width = page.rect.width
-                page_height = page.rect.height
-
-                for img in images:
-                    try:
-                        xref = img[0]
-                        base = pdf.extract_image(xref)
-                        img_bytes = base["image"]
-                        width = base.get("width", 0)
-                        height = base.get("height", 0)
-
-                        # Skip tiny icons or logos
-                        if width < 120 or height < 120:
-                            continue
-
-                        # Skip color-indexed (transparent watermark)
-                        if base.get("colorspace", "") == "indexed":
-                            continue
-
-                        # Skip header/footer watermarks
-                        bbox = page.get_image_bbox(xref)
-                        if bbox.y0 < page_height * 0.10 or bbox.y1 > page_height * 0.90:
-                            continue
-
-                        # Skip duplicates
-                        h = hashlib.sha256(img_bytes).hexdigest()
-                        if h in added_hashes:
-                            continue
-                        added_hashes.add(h)
-
-                        img_pil = Image.open(io.BytesIO(img_bytes))
-                        if img_pil.mode in ("P", "RGBA"):
-                            img_pil = img_pil.convert("RGB")
-
-                        final = io.BytesIO()
-                        img_pil.save(final, format="PNG")
-                        final.seek(0)
-
-                        max_width = 5.0
-                        dpi = 96
-                        width_in = min(img_pil.width / dpi, max_width)
-
-                        doc.add_picture(final, width=Inches(width_in))
-
-                    except Exception:
-                        continue
-
-                if page_index < len(pdf) - 1:
-                    doc.add_page_break()
-
-            pdf.close()
-
-            # -----------------------------
-            # Step 4: Save final docx
-            # -----------------------------
-            output = io.BytesIO()
-            doc.save(output)
-            return output.getvalue()
-
-        except Exception as e:
-            _logger.error("PDF → DOCX conversion failed: %s", e)
-            return None
+        return request.env['docx.pdf.converter']._convert_pdf_to_docx(pdf_data)
 
     # --------------------------------------------------------------------------
     def _extract_filename(self, response):
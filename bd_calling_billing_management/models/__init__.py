@@ -2,4 +2,8 @@ from . import sale_order
 from . import product
 from . import pricelist
 from . import ir_actions_report
+from . import docx_converter
+from . import docx_conversion_job
+from . import word_report
+from . import invoice_docx_report
 # from . import format_selector
\ No newline at end of file
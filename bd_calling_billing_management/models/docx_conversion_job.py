@@ -0,0 +1,130 @@
+import json
+import logging
+import threading
+import time
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools.safe_eval import safe_eval
+
+_logger = logging.getLogger(__name__)
+
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+class DocxConversionJob(models.Model):
+    _name = 'docx.conversion.job'
+    _description = 'DOCX Report Conversion Job'
+    _order = 'id desc'
+
+    name = fields.Char(string='File Name')
+    report_name = fields.Char(string='Report', required=True)
+    res_ids = fields.Char(string='Record IDs', required=True, help='JSON list of the printed record ids')
+    report_data = fields.Text(string='Report Data', help='JSON data passed to the report')
+    lang = fields.Char(string='Language')
+    state = fields.Selection(
+        [('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')],
+        string='Status',
+        default='pending',
+        required=True,
+        index=True,
+    )
+    attachment_id = fields.Many2one('ir.attachment', string='DOCX File', readonly=True, ondelete='set null')
+    error_message = fields.Text(string='Error', readonly=True)
+
+    @api.model
+    def _enqueue(self, report_name, res_ids, data=None):
+        """Create a pending conversion job and wake up the conversion cron"""
+        job = self.create({
+            'report_name': report_name,
+            'res_ids': json.dumps(list(res_ids)),
+            'report_data': json.dumps(data) if data else False,
+            'lang': self.env.context.get('lang') or self.env.user.lang,
+        })
+        self.env.ref('bd_calling_billing_management.ir_cron_docx_conversion_jobs').sudo()._trigger()
+        return job
+
+    @api.model
+    def _process_pending_jobs(self, limit=10):
+        """Cron entry point: convert pending jobs one at a time, committing after each"""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        for _index in range(limit):
+            self.env.cr.execute("""
+                SELECT id FROM docx_conversion_job
+                 WHERE state = 'pending'
+              ORDER BY id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """)
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            self.browse(row[0])._run()
+            if auto_commit:
+                self.env.cr.commit()
+
+    def _run(self):
+        """Render the report to PDF as the requesting user, convert it and store the DOCX"""
+        self.ensure_one()
+        self.state = 'running'
+        start = time.perf_counter()
+        try:
+            with self.env.cr.savepoint():
+                docx_bytes, filename = self._render_docx()
+                attachment = self.env['ir.attachment'].sudo().create({
+                    'name': filename,
+                    'raw': docx_bytes,
+                    'mimetype': DOCX_MIMETYPE,
+                    'res_model': self._name,
+                    'res_id': self.id,
+                })
+            self.write({
+                'state': 'done',
+                'name': filename,
+                'attachment_id': attachment.id,
+                'error_message': False,
+            })
+            _logger.info("DOCX job %s converted in %.2fs", self.id, time.perf_counter() - start)
+        except Exception as e:
+            _logger.error("DOCX job %s failed: %s", self.id, e)
+            self.write({'state': 'failed', 'error_message': str(e)})
+
+    def _render_docx(self):
+        Report = self.env['ir.actions.report'].with_user(self.create_uid).with_context(lang=self.lang)
+        report = Report._get_report(self.report_name)
+        res_ids = json.loads(self.res_ids)
+        data = json.loads(self.report_data) if self.report_data else None
+
+        if report.report_type == 'docx':
+            # Native python-docx report, no PDF round-trip needed
+            docx_bytes, _content_type = Report._render(report, res_ids, data=data)
+        else:
+            pdf_content, _content_type = Report._render_qweb_pdf(report, res_ids, data=data)
+            docx_bytes = self.env['docx.pdf.converter']._convert_pdf_to_docx(pdf_content)
+        if not docx_bytes:
+            raise UserError(_("PDF to DOCX conversion failed for report %s", report.name))
+        return docx_bytes, self._get_docx_filename(report, res_ids)
+
+    @api.model
+    def _get_docx_filename(self, report, res_ids):
+        filename = report.name
+        if report.print_report_name and len(res_ids) == 1:
+            # report carries the environment of the user who prints it
+            record = report.env[report.model].browse(res_ids)
+            try:
+                filename = safe_eval(report.print_report_name, {'object': record, 'time': time})
+            except Exception:
+                _logger.warning("Could not evaluate print_report_name of %s", report.report_name)
+        # print_report_name of the invoice reports already carries a .pdf extension
+        if filename.endswith('.pdf'):
+            filename = filename[:-len('.pdf')]
+        elif filename.endswith('.docx'):
+            filename = filename[:-len('.docx')]
+        return f"{filename}.docx"
+
+    @api.autovacuum
+    def _gc_conversion_jobs(self):
+        """Remove conversion jobs (and their files) older than a day"""
+        jobs = self.search([('create_date', '<', fields.Datetime.subtract(fields.Datetime.now(), days=1))])
+        jobs.attachment_id.unlink()
+        jobs.unlink()
@@ -0,0 +1,289 @@
+import hashlib
+import json
+import logging
+import re
+
+from odoo import models, api
+
+from .docx_conversion_job import DOCX_MIMETYPE
+
+_logger = logging.getLogger(__name__)
+
+# Options passed to pdf2docx; part of the cache key so changing them
+# invalidates previously converted files
+PDF2DOCX_OPTIONS = {
+    'parse_table': True,            # ✅ Enable to get table data
+    'detect_vertical': False,
+    'detect_horizontal': False,
+    'images': False,                # images handled manually later
+}
+# Bump when the post-processing (totals, images) changes
+CONVERTER_VERSION = 2
+
+DOCX_CACHE_MODEL = 'docx.pdf.converter'
+DOCX_CACHE_MAX_SIZE_PARAM = 'bd_calling_billing_management.docx_cache_max_size_mb'
+DOCX_CACHE_DEFAULT_MAX_SIZE_MB = 200
+
+# Entries that change on every render of the same document: the Info
+# dictionary timestamps written by wkhtmltopdf and the trailer file identifier
+PDF_VOLATILE_ENTRIES = re.compile(
+    rb'/(?:CreationDate|ModDate)\s*\((?:[^()\\]|\\.)*\)'
+    rb'|/ID\s*\[\s*<[0-9A-Fa-f]*>\s*<[0-9A-Fa-f]*>\s*\]'
+)
+
+# Per-process cache counters, see _get_docx_cache_stats()
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+class DocxPdfConverter(models.AbstractModel):
+    _name = 'docx.pdf.converter'
+    _description = 'PDF to DOCX Converter'
+
+    @api.model
+    def _convert_pdf_to_docx(self, pdf_data):
+        """Convert PDF bytes to DOCX, reusing a cached result for identical input"""
+        settings = dict(PDF2DOCX_OPTIONS, version=CONVERTER_VERSION)
+        return self._get_cached_docx(pdf_data, settings, self._convert_pdf_to_docx_uncached)
+
+    # --------------------------------------------------------------------------
+    # Content-addressed cache: sha256(PDF bytes + converter settings) -> DOCX
+    @api.model
+    def _get_docx_cache_key(self, pdf_data, settings):
+        # Re-rendering an unchanged document only changes its timestamps and
+        # file identifier, which must not make the key differ
+        digest = hashlib.sha256(PDF_VOLATILE_ENTRIES.sub(b'', pdf_data))
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    @api.model
+    def _get_cached_docx(self, pdf_data, settings, convert):
+        """Return the DOCX cached for ``pdf_data``/``settings`` or build it with ``convert``"""
+        Attachment = self.env['ir.attachment'].sudo()
+        key = self._get_docx_cache_key(pdf_data, settings)
+        name = f'docx_cache_{key}.docx'
+
+        cached = Attachment.search([
+            ('res_model', '=', DOCX_CACHE_MODEL),
+            ('name', '=', name),
+        ], limit=1)
+        if cached:
+            _cache_stats['hits'] += 1
+            # Refresh the entry so it is evicted last
+            self.env.cr.execute(
+                "UPDATE ir_attachment SET write_date = (now() at time zone 'UTC') WHERE id = %s",
+                [cached.id],
+            )
+            return cached.raw
+
+        _cache_stats['misses'] += 1
+        docx_bytes = convert(pdf_data)
+        if docx_bytes:
+            Attachment.create({
+                'name': name,
+                'raw': docx_bytes,
+                'mimetype': DOCX_MIMETYPE,
+                'res_model': DOCX_CACHE_MODEL,
+            })
+            self._evict_docx_cache()
+        return docx_bytes
+
+    @api.model
+    def _evict_docx_cache(self):
+        """Drop least recently used entries until the cache fits its size budget"""
+        max_size_mb = int(self.env['ir.config_parameter'].sudo().get_param(
+            DOCX_CACHE_MAX_SIZE_PARAM, DOCX_CACHE_DEFAULT_MAX_SIZE_MB))
+        max_size = max_size_mb * 1024 * 1024
+
+        Attachment = self.env['ir.attachment'].sudo()
+        entries = Attachment.search_read(
+            [('res_model', '=', DOCX_CACHE_MODEL)],
+            ['file_size'],
+            order='write_date desc, id desc',
+        )
+        total = 0
+        evicted_ids = []
+        for entry in entries:
+            total += entry['file_size'] or 0
+            if total > max_size:
+                evicted_ids.append(entry['id'])
+        if evicted_ids:
+            Attachment.browse(evicted_ids).unlink()
+            _logger.info("DOCX cache: evicted %s entries", len(evicted_ids))
+
+    @api.model
+    def _get_docx_cache_stats(self):
+        """Hit/miss counters of this worker and the current cache footprint"""
+        self.env.cr.execute("""
+            SELECT count(*), coalesce(sum(file_size), 0)
+              FROM ir_attachment
+             WHERE res_model = %s
+        """, [DOCX_CACHE_MODEL])
+        entries, size = self.env.cr.fetchone()
+        lookups = _cache_stats['hits'] + _cache_stats['misses']
+        return {
+            'hits': _cache_stats['hits'],
+            'misses': _cache_stats['misses'],
+            'hit_ratio': round(_cache_stats['hits'] / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': size,
+        }
+
+    # --------------------------------------------------------------------------
+    # ✅ PDF → DOCX in memory: one PDF open, one page pass for totals + images
+    @api.model
+    def _convert_pdf_to_docx_uncached(self, pdf_data):
+        import io
+        from PIL import Image
+        from pdf2docx import Converter
+        from docx import Document
+        from docx.shared import Inches
+
+        try:
+            # -----------------------------
+            # Step 1: PDF → DOCX with table parsing, fully in memory
+            # -----------------------------
+            cv = Converter(stream=pdf_data)
+            try:
+                docx_buffer = io.BytesIO()
+                cv.convert(docx_buffer, start=0, end=None, **PDF2DOCX_OPTIONS)
+
+                # -----------------------------
+                # Step 2: single pass over the PDF pdf2docx already opened
+                # -----------------------------
+                pdf = cv.fitz_doc
+                page_totals = []
+                page_images = []
+                added_hashes = set()
+                for page in pdf:
+                    page_totals.append(self._extract_page_totals(page))
+                    page_images.append(self._extract_page_images(pdf, page, added_hashes))
+            finally:
+                cv.close()
+
+            docx_buffer.seek(0)
+            doc = Document(docx_buffer)
+
+            # -----------------------------
+            # Step 3: totals first, then images page by page (same layout as before)
+            # -----------------------------
+            for totals_text in page_totals:
+                if totals_text:
+                    self._add_totals_paragraph(doc, totals_text)
+
+            for page_index, images in enumerate(page_images):
+                for img_bytes, ext, width in images:
+                    try:
+                        if ext not in ('png', 'jpeg', 'jpg'):
+                            # Only re-encode formats Word cannot embed as-is
+                            img_pil = Image.open(io.BytesIO(img_bytes))
+                            if img_pil.mode in ("P", "RGBA"):
+                                img_pil = img_pil.convert("RGB")
+                            final = io.BytesIO()
+                            img_pil.save(final, format="PNG")
+                            img_bytes = final.getvalue()
+
+                        width_in = min(width / 96, 5.0)
+                        doc.add_picture(io.BytesIO(img_bytes), width=Inches(width_in))
+                    except Exception:
+                        continue
+
+                if page_index < len(page_images) - 1:
+                    doc.add_page_break()
+
+            # -----------------------------
+            # Step 4: Save final docx
+            # -----------------------------
+            output = io.BytesIO()
+            doc.save(output)
+            return output.getvalue()
+
+        except Exception as e:
+            _logger.error("PDF → DOCX conversion failed: %s", e)
+            return None
+
+    @api.model
+    def _extract_page_totals(self, page):
+        """Text of the bottom-right corner of a page if it looks like a totals block"""
+        import fitz
+
+        # Right 40% of page, bottom 25% of page
+        totals_rect = fitz.Rect(
+            page.rect.width * 0.60,
+            page.rect.height * 0.75,
+            page.rect.width,
+            page.rect.height,
+        )
+        totals_text = page.get_text("text", clip=totals_rect).strip()
+        if totals_text and any(keyword in totals_text.lower()
+                               for keyword in ['subtotal', 'tax', 'total', 'amount']):
+            _logger.info("Found totals section: %s", totals_text[:100])
+            return totals_text
+        return False
+
+    @api.model
+    def _extract_page_images(self, pdf, page, added_hashes):
+        """Content images of a page as (bytes, extension, width) tuples.
+
+        Skips icons, indexed-colour watermarks, header/footer images and
+        images already seen on a previous page.
+        """
+        images = []
+        page_height = page.rect.height
+        for img in page.get_images(full=True):
+            try:
+                xref = img[0]
+                base = pdf.extract_image(xref)
+                img_bytes = base["image"]
+                width = base.get("width", 0)
+                height = base.get("height", 0)
+
+                # Skip tiny icons or logos
+                if width < 120 or height < 120:
+                    continue
+
+                # Skip color-indexed (transparent watermark)
+                if base.get("colorspace", "") == "indexed":
+                    continue
+
+                # Skip header/footer watermarks
+                bbox = page.get_image_bbox(xref)
+                if bbox.y0 < page_height * 0.10 or bbox.y1 > page_height * 0.90:
+                    continue
+
+                # Skip duplicates
+                h = hashlib.sha256(img_bytes).hexdigest()
+                if h in added_hashes:
+                    continue
+                added_hashes.add(h)
+
+                images.append((img_bytes, base.get("ext", ""), width))
+            except Exception:
+                continue
+        return images
+
+    @api.model
+    def _add_totals_paragraph(self, doc, totals_text):
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        # Add spacing before totals
+        doc.add_paragraph()
+
+        # Create a right-aligned paragraph for totals
+        totals_paragraph = doc.add_paragraph()
+        totals_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+        if 'Total:' not in totals_text and 'total:' not in totals_text:
+            run = totals_paragraph.add_run(totals_text)
+            run.font.size = Pt(10)
+            run.font.name = 'Arial'
+            return
+
+        # One run per line so the "Total:" line can be made bold
+        for line in totals_text.split('\n'):
+            if line.strip():
+                run = totals_paragraph.add_run(line + '\n')
+                run.font.size = Pt(10)
+                run.font.name = 'Arial'
+                if 'total:' in line.lower():
+                    run.font.bold = True
@@ -0,0 +1,143 @@
+import io
+
+from odoo import models, api
+from odoo.tools.misc import formatLang, format_date
+
+
+class InvoiceDocxReport(models.AbstractModel):
+    """Builds invoice DOCX files directly with python-docx.
+
+    Used by the ``docx`` report type: the document is generated from the same
+    account.move data as the QWeb invoice templates, without rendering a PDF
+    and converting it back.
+    """
+    _name = 'report.bd_calling_billing_management.invoice_docx'
+    _description = 'Invoice DOCX Report'
+
+    # Show the test columns (test per unit, total test, price per test)
+    _with_test = False
+
+    @api.model
+    def _render_docx(self, docids, data=None):
+        from docx import Document
+
+        moves = self.env['account.move'].browse(docids)
+        # Load every line of the batch at once
+        moves.invoice_line_ids.fetch([
+            'product_id', 'quantity', 'price_unit', 'price_subtotal', 'price_total',
+            'test_per_unit', 'total_test', 'price_per_test', 'display_type', 'tax_ids',
+        ])
+        moves.invoice_line_ids.tax_ids.fetch(['name'])
+
+        doc = Document()
+        for index, move in enumerate(moves):
+            if index:
+                doc.add_page_break()
+            self._add_header(doc, move)
+            self._add_lines_table(doc, move)
+            self._add_totals(doc, move)
+
+        output = io.BytesIO()
+        doc.save(output)
+        return output.getvalue()
+
+    def _format_amount(self, amount, currency):
+        return formatLang(self.env, amount, currency_obj=currency)
+
+    def _add_header(self, doc, move):
+        from docx.shared import Pt
+
+        company_paragraph = doc.add_paragraph()
+        company_run = company_paragraph.add_run(move.company_id.name or '')
+        company_run.bold = True
+        company_run.font.size = Pt(14)
+
+        table = doc.add_table(rows=1, cols=2)
+        table.style = 'Table Grid'
+        bill_to, details = table.rows[0].cells
+
+        bill_to.paragraphs[0].add_run('Bill To').bold = True
+        bill_to.add_paragraph().add_run(move.partner_id.display_name or '').bold = True
+        bill_to.add_paragraph(move.partner_id.street or '')
+        bill_to.add_paragraph(move.partner_id.city or '')
+
+        rows = [
+            ('Date', format_date(self.env, move.invoice_date) if move.invoice_date else ''),
+            ('Bill No.', move.name or ''),
+            ('P/O No.', move.invoice_origin or ''),
+            ('Chalian No.', move.custom_chalian_number or ''),
+        ]
+        details.paragraphs[0].text = ''
+        for label, value in rows:
+            paragraph = details.add_paragraph()
+            paragraph.add_run(f'{label}: ').bold = True
+            paragraph.add_run(value)
+        doc.add_paragraph()
+
+    def _add_lines_table(self, doc, move):
+        currency = move.currency_id
+        if self._with_test:
+            headers = ['Product', 'Quantity', 'Tests Per Unit', 'Total Tests', 'Price Per Test',
+                       'Taxes', 'Tax Amount', 'Subtotal']
+        else:
+            headers = ['Description', 'Quantity', 'Unit Price', 'Taxes', 'Tax Amount', 'Amount']
+
+        lines = move.invoice_line_ids.filtered(lambda line: line.display_type == 'product')
+        table = doc.add_table(rows=1, cols=len(headers))
+        table.style = 'Table Grid'
+        for cell, header in zip(table.rows[0].cells, headers):
+            cell.paragraphs[0].add_run(header).bold = True
+
+        for line in lines:
+            # Same per-line VAT as the Mushak template, so the lines add up to the totals
+            taxes = [
+                ', '.join(line.tax_ids.mapped('name')) or '0%',
+                self._format_amount(line.price_total - line.price_subtotal, currency),
+            ]
+            if self._with_test:
+                values = [
+                    line.product_id.name or '',
+                    formatLang(self.env, line.quantity),
+                    str(line.test_per_unit),
+                    str(line.total_test),
+                    self._format_amount(line.price_per_test, currency),
+                    *taxes,
+                    self._format_amount(line.price_subtotal, currency),
+                ]
+            else:
+                values = [
+                    line.product_id.name or '',
+                    formatLang(self.env, line.quantity),
+                    self._format_amount(line.price_unit, currency),
+                    *taxes,
+                    self._format_amount(line.price_total, currency),
+                ]
+            cells = table.add_row().cells
+            for cell, value in zip(cells, values):
+                cell.text = value
+            for run in cells[0].paragraphs[0].runs:
+                run.bold = True
+        doc.add_paragraph()
+
+    def _add_totals(self, doc, move):
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+        currency = move.currency_id
+        totals = [
+            ('Subtotal:', move.amount_untaxed, False),
+            ('Tax:', move.amount_tax, False),
+            ('Total:', move.amount_total, True),
+        ]
+        for label, amount, bold in totals:
+            paragraph = doc.add_paragraph()
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            run = paragraph.add_run(f'{label} {self._format_amount(amount, currency)}')
+            run.bold = bold
+
+
+class InvoiceWithTestDocxReport(models.AbstractModel):
+    _name = 'report.bd_calling_billing_management.invoice_with_test_docx'
+    _inherit = 'report.bd_calling_billing_management.invoice_docx'
+    _description = 'Invoice With Test DOCX Report'
+
+    _with_test = True
@@ -4,4 +4,16 @@ from odoo import models, fields
 class IrActionsReport(models.Model):
     _inherit = "ir.actions.report"
 
+    # Converts a QWeb report to DOCX through the background queue (PDF → DOCX);
+    # reports of type 'docx' are built natively and never go through it
     is_docx_report = fields.Boolean(string="DOCX Report", default=False)
+
+    def _get_readable_fields(self):
+        # Let the web client know which reports go through the DOCX queue
+        return super()._get_readable_fields() | {'is_docx_report'}
+
+    def report_action(self, docids, data=None, config=True):
+        action = super().report_action(docids, data=data, config=config)
+        if action.get('type') == 'ir.actions.report':
+            action['is_docx_report'] = self.is_docx_report
+        return action
@@ -1,9 +1,26 @@
 from odoo import models, fields
+from odoo.exceptions import AccessError
 
 class Product(models.Model):
     _inherit = 'product.template'
     test_count = fields.Integer('Test Count')
     
+    def action_recompute_test_metrics(self):
+        """Recompute the test metrics of the sale order lines of these products"""
+        if not self.env.is_admin():
+            raise AccessError("Only administrators can recompute test metrics.")
+        count = self.env['sale.order.line']._recompute_test_metrics([
+            ('product_id.product_tmpl_id', 'in', self.ids),
+        ])
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'success',
+                'message': f"Test metrics recomputed on {count} sale order lines.",
+            },
+        }
+    
 class ProductProduct(models.Model):
     _inherit = 'product.product'
     
@@ -1,9 +1,16 @@
 import logging
 import base64
+import threading
+from collections import defaultdict
 
-from odoo import models, fields, api
+from odoo import models, fields, api, Command
+from odoo.tools import split_every
 _logger = logging.getLogger(__name__)
 
+TEST_METRIC_FIELDS = ['test_per_unit', 'total_test', 'price_per_test']
+# Sale order lines recomputed per transaction by _recompute_test_metrics
+TEST_METRICS_BATCH_SIZE = 1000
+
 # class SaleOrderLine(models.Model):
 #     _inherit = 'sale.order.line'
 
@@ -28,20 +35,20 @@ class SaleOrderLine(models.Model):
     # price_per_test = fields.Float(string='Price Per Test')
     test_per_unit = fields.Integer(
         string='Test per Unit',
-        compute='_compute_test_per_unit',
+        compute='_compute_test_metrics',
         store=True
         
     )
     
     total_test = fields.Integer(
          string='Total Test',
-       compute='_compute_total_test',
+       compute='_compute_test_metrics',
          store=True
     )
     
     price_per_test = fields.Float(
          string='Price per Test',
-         compute='_compute_price_per_test',
+         compute='_compute_test_metrics',
          store=True,
          digits='Product Price'
      )
@@ -87,28 +94,49 @@ class SaleOrderLine(models.Model):
     #         self.categ_id = self.product_id.categ_id
     #     return super()._onchange_product_id()
     
-    @api.depends('product_id', 'product_id.test_count')
-    def _compute_test_per_unit(self):
-        for record in self:
-            if record.product_id and record.product_id.test_count:
-                record.test_per_unit = record.product_id.test_count
-                _logger.info(f"Set test_per_unit to {record.test_per_unit} for product {record.product_id.name}")
-            else:
-                record.test_per_unit = 0
-                _logger.info(f"No test_count found for product {record.product_id.name if record.product_id else 'None'}")
-    
-    @api.depends('product_uom_qty', 'test_per_unit')
-    def _compute_total_test(self):
+    @api.depends('product_id.test_count', 'product_uom_qty', 'price_unit')
+    def _compute_test_metrics(self):
+        """Compute test per unit, total test and price per test in one pass"""
+        # Read test_count of every product of the batch at once
+        self.product_id.fetch(['test_count'])
         for record in self:
-            record.total_test = record.product_uom_qty * record.test_per_unit
+            test_per_unit = record.product_id.test_count or 0
+            record.test_per_unit = test_per_unit
+            record.total_test = record.product_uom_qty * test_per_unit
+            record.price_per_test = record.price_unit / test_per_unit if test_per_unit > 0 else 0
+        
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug(f"Computed test metrics for {len(self)} sale order lines")
     
-    @api.depends('price_unit', 'test_per_unit')
-    def _compute_price_per_test(self):
-        for record in self:
-            if record.test_per_unit and record.test_per_unit > 0:
-                record.price_per_test = record.price_unit / record.test_per_unit
-            else:
-                record.price_per_test = 0
+    @api.model
+    def _recompute_test_metrics(self, domain=None, batch_size=TEST_METRICS_BATCH_SIZE):
+        """Recompute the stored test metrics of the lines matching ``domain``.
+
+        Lines are processed in chunks of ``batch_size`` with a commit after
+        each chunk, so that large histories can be fixed without one huge
+        transaction. The invoice lines copying these values are refreshed too.
+        """
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        line_ids = self.search(domain or []).ids
+        line_fields = [self._fields[name] for name in TEST_METRIC_FIELDS]
+        invoice_line_fields = [self.env['account.move.line']._fields[name] for name in TEST_METRIC_FIELDS]
+        
+        for index, chunk_ids in enumerate(split_every(batch_size, line_ids), start=1):
+            lines = self.browse(chunk_ids)
+            for field in line_fields:
+                self.env.add_to_compute(field, lines)
+            lines.flush_recordset(TEST_METRIC_FIELDS)
+            
+            invoice_lines = lines.invoice_lines
+            for field in invoice_line_fields:
+                self.env.add_to_compute(field, invoice_lines)
+            invoice_lines.flush_recordset(TEST_METRIC_FIELDS)
+            
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            _logger.info(f"Recomputed test metrics: {min(index * batch_size, len(line_ids))}/{len(line_ids)} lines")
+        return len(line_ids)
     
     @api.onchange('categ_id')
     def _onchange_categ_id(self):
@@ -124,16 +152,23 @@ class SaleOrderLine(models.Model):
             _logger.info(f"Product selected: {self.product_id.name}, Category: {self.product_id.categ_id}")
             _logger.info(f"Product test_count: {getattr(self.product_id, 'test_count', 'NOT FOUND')}")
             self.categ_id = self.product_id.categ_id
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Apply pricelist tax when new lines are created"""
-        line = super().create(vals)
+        order_ids = {vals['order_id'] for vals in vals_list if vals.get('order_id')}
+        orders = self.env['sale.order'].browse(order_ids)
+        # Read the pricelist taxes of all orders at once
+        orders.fetch(['pricelist_id'])
+        orders.pricelist_id.fetch(['tax_id'])
         
-        # Apply pricelist tax if available
-        if line.order_id.pricelist_id and line.order_id.pricelist_id.tax_id:
-            line.tax_ids = [(6, 0, [line.order_id.pricelist_id.tax_id.id])]
+        for vals in vals_list:
+            if not vals.get('order_id'):
+                continue
+            pricelist = orders.browse(vals['order_id']).pricelist_id
+            if pricelist.tax_id:
+                vals['tax_ids'] = [Command.set(pricelist.tax_id.ids)]
         
-        return line
+        return super().create(vals_list)
     
     def _prepare_invoice_line(self, **optional_values):
         """Copy test fields from sale order line to invoice line"""
@@ -160,19 +195,7 @@ class SaleOrder(models.Model):
         """Apply pricelist tax to ALL order lines when pricelist is selected"""
         if self.pricelist_id and self.pricelist_id.tax_id:
             # Apply the tax to all existing order lines
-            for line in self.order_line:
-                line.tax_ids = [(6, 0, [self.pricelist_id.tax_id.id])]
-    
-    # Also apply tax when new lines are added
-    def _create_order_line_from_ui(self, product, quantity, **kwargs):
-        """Override to apply pricelist tax when adding lines from UI"""
-        line = super()._create_order_line_from_ui(product, quantity, **kwargs)
-        
-        # Apply pricelist tax to the new line
-        if self.pricelist_id and self.pricelist_id.tax_id:
-            line.tax_ids = [(6, 0, [self.pricelist_id.tax_id.id])]
-        
-        return line
+            self.order_line.update({'tax_ids': [Command.set(self.pricelist_id.tax_id.ids)]})
     
     def action_print_custom_quotation(self):
         """Print custom quotation without test data"""
@@ -224,18 +247,41 @@ class AccountMove(models.Model):
     #                 chalian_number = delivery.name  # 'WH/OUT/00058'
             
     #         invoice.custom_chalian_number = chalian_number
-    @api.depends('invoice_origin')
+    @api.depends('invoice_origin', 'line_ids.sale_line_ids.order_id.picking_ids.name')
     def _compute_chalian_number(self):
-        for invoice in self:
-            delivery_ids = []
-            if invoice.invoice_origin:
-                deliveries = self.env['stock.picking'].search([
-                    ('origin', '=', invoice.invoice_origin),
-                    ('picking_type_id.code', '=', 'outgoing')
-                ])
-                delivery_ids = deliveries.mapped('name')
-            
-            invoice.custom_chalian_number = ', '.join(delivery_ids) if delivery_ids else False
+        """Delivery order names of the invoiced sale orders.
+
+        The outgoing pickings of the whole batch are read in one query, either
+        through the sale orders linked to the invoice lines or, for invoices
+        without sale lines, by matching their source document.
+        """
+        orders_by_invoice = {invoice: invoice.line_ids.sale_line_ids.order_id for invoice in self}
+        orders = self.env['sale.order'].union(*orders_by_invoice.values())
+        origins = list({
+            invoice.invoice_origin
+            for invoice, invoice_orders in orders_by_invoice.items()
+            if invoice.invoice_origin and not invoice_orders
+        })
+        
+        names_by_order = defaultdict(list)
+        names_by_origin = defaultdict(list)
+        if orders or origins:
+            pickings = self.env['stock.picking'].search_fetch([
+                ('picking_type_code', '=', 'outgoing'),
+                '|', ('sale_id', 'in', orders.ids), ('origin', 'in', origins),
+            ], ['name', 'origin', 'sale_id'])
+            for picking in pickings:
+                if picking.sale_id:
+                    names_by_order[picking.sale_id.id].append(picking.name)
+                if picking.origin:
+                    names_by_origin[picking.origin].append(picking.name)
+        
+        for invoice, invoice_orders in orders_by_invoice.items():
+            if invoice_orders:
+                delivery_names = [name for order in invoice_orders for name in names_by_order[order.id]]
+            else:
+                delivery_names = names_by_origin[invoice.invoice_origin] if invoice.invoice_origin else []
+            invoice.custom_chalian_number = ', '.join(delivery_names) if delivery_names else False
     
     # def action_print_custom_quotation(self):
     #     """Print custom quotation without test data"""
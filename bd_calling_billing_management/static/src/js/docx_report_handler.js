@@ -2,6 +2,7 @@
 /** @odoo-module **/
 
 import { registry } from "@web/core/registry";
+import { rpc } from "@web/core/network/rpc";
 
 // Monkey-patch the download function
 const originalDownload = window.download;
@@ -40,11 +41,66 @@ window.download = function(data, options) {
     return originalDownload.apply(this, arguments);
 };
 
-// Register our handler
+// Poll interval (ms) and maximum wait for a background DOCX conversion
+const DOCX_POLL_INTERVAL = 2000;
+const DOCX_POLL_TIMEOUT = 5 * 60 * 1000;
+
+function sleep(ms) {
+    return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+// Register our handler: native 'docx' reports are downloaded directly, PDF
+// based DOCX reports are converted by a background job, the client polls the
+// job status and downloads the file once it is stored
 registry.category("ir.actions.report handlers").add("docx_rename_handler", async function(action, options, env) {
-    if (action.name && action.name.includes('DOCX')) {
-        // Let Odoo handle it normally, our monkey-patch will rename it
+    const context = action.context || {};
+    const hasData = action.data && Object.keys(action.data).length;
+    const docids = hasData ? [] : (context.active_ids || []);
+
+    // Native DOCX reports are built directly by the server, no queue needed
+    if (action.report_type === "docx") {
+        let url = `/report/docx/native/${action.report_name}`;
+        if (docids.length) {
+            url += `/${docids.join(",")}`;
+        }
+        if (hasData) {
+            url += `?data=${encodeURIComponent(JSON.stringify(action.data))}`;
+        }
+        window.location.assign(url);
+        if (options && options.onClose) {
+            options.onClose();
+        }
+        return true;
+    }
+
+    if (!action.is_docx_report) {
         return false;
     }
-    return false;
-});
\ No newline at end of file
+
+    const { job_id } = await rpc("/report/docx/enqueue", {
+        report_name: action.report_name,
+        docids: docids,
+        data: hasData ? action.data : null,
+        context: { lang: context.lang },
+    });
+    env.services.notification.add("Your DOCX report is being generated...", { type: "info" });
+
+    const deadline = Date.now() + DOCX_POLL_TIMEOUT;
+    while (Date.now() < deadline) {
+        await sleep(DOCX_POLL_INTERVAL);
+        const status = await rpc(`/report/docx/status/${job_id}`, {});
+        if (status.state === "done") {
+            window.location.assign(status.download_url);
+            if (options && options.onClose) {
+                options.onClose();
+            }
+            return true;
+        }
+        if (status.state === "failed") {
+            env.services.notification.add(status.error || "DOCX conversion failed", { type: "danger" });
+            return true;
+        }
+    }
+    env.services.notification.add("DOCX conversion is taking longer than expected, please try again later.", { type: "warning" });
+    return true;
+});
@@ -0,0 +1,156 @@
+"""Benchmark of the DOCX paths on the bundled invoice reports.
+
+Run from an Odoo shell of a database with at least one posted customer invoice::
+
+    odoo-bin shell -d <database> < bd_calling_billing_management/tools/benchmark_docx_conversion.py
+
+For the latest posted invoice and each invoice report it prints the average
+time, in seconds, of:
+
+* ``legacy``: pdf2docx through temporary files, with the PDF opened a second
+  time and walked twice (totals, then images), every image re-encoded as PNG;
+* ``in_memory``: the current converter, ``_convert_pdf_to_docx_uncached``;
+* ``cached``: ``_convert_pdf_to_docx`` on a PDF that was already converted;
+* ``native``: the python-docx builder of the matching ``docx`` report.
+
+The shell does not commit, so the cache entries created here are discarded.
+"""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+_logger = logging.getLogger(__name__)
+
+ROUNDS = 3
+
+# PDF invoice report -> native DOCX report of the same document, if any
+INVOICE_REPORTS = {
+    'bd_calling_billing_management.action_report_custom_quotation_pdf':
+        'bd_calling_billing_management.action_report_custom_quotation_docx',
+    'bd_calling_billing_management.action_report_with_test_pdf':
+        'bd_calling_billing_management.action_report_with_test_docx',
+    'bd_calling_billing_management.action_report_invoice_mushak': None,
+}
+
+
+def convert_legacy(pdf_data, options):
+    """Previous PDF → DOCX converter, kept here as the benchmark baseline"""
+    import fitz
+    from PIL import Image
+    from pdf2docx import Converter
+    from docx import Document
+    from docx.shared import Inches, Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_pdf, \
+            tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as tmp_docx:
+        tmp_pdf.write(pdf_data)
+        tmp_pdf.flush()
+        cv = Converter(tmp_pdf.name)
+        cv.convert(tmp_docx.name, start=0, end=None, **options)
+        cv.close()
+        with open(tmp_docx.name, "rb") as docx_file:
+            docx_bytes = docx_file.read()
+    os.unlink(tmp_pdf.name)
+    os.unlink(tmp_docx.name)
+
+    doc = Document(io.BytesIO(docx_bytes))
+    pdf = fitz.open(stream=pdf_data, filetype="pdf")
+
+    # First page pass: totals from the bottom-right corner
+    for page in pdf:
+        totals_rect = fitz.Rect(page.rect.width * 0.60, page.rect.height * 0.75, page.rect.width, page.rect.height)
+        totals_text = page.get_text("text", clip=totals_rect).strip()
+        if totals_text and any(keyword in totals_text.lower() for keyword in ['subtotal', 'tax', 'total', 'amount']):
+            doc.add_paragraph()
+            totals_paragraph = doc.add_paragraph()
+            totals_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            for line in totals_text.split('\n'):
+                if line.strip():
+                    run = totals_paragraph.add_run(line + '\n')
+                    run.font.size = Pt(10)
+                    run.font.name = 'Arial'
+                    run.font.bold = 'total:' in line.lower()
+
+    # Second page pass: content images, always re-encoded as PNG
+    added_hashes = set()
+    for page_index, page in enumerate(pdf):
+        for img in page.get_images(full=True):
+            try:
+                base = pdf.extract_image(img[0])
+                if base.get("width", 0) < 120 or base.get("height", 0) < 120:
+                    continue
+                if base.get("colorspace", "") == "indexed":
+                    continue
+                bbox = page.get_image_bbox(img[0])
+                if bbox.y0 < page.rect.height * 0.10 or bbox.y1 > page.rect.height * 0.90:
+                    continue
+                digest = hashlib.sha256(base["image"]).hexdigest()
+                if digest in added_hashes:
+                    continue
+                added_hashes.add(digest)
+
+                img_pil = Image.open(io.BytesIO(base["image"]))
+                if img_pil.mode in ("P", "RGBA"):
+                    img_pil = img_pil.convert("RGB")
+                final = io.BytesIO()
+                img_pil.save(final, format="PNG")
+                final.seek(0)
+                doc.add_picture(final, width=Inches(min(img_pil.width / 96, 5.0)))
+            except Exception:
+                continue
+        if page_index < len(pdf) - 1:
+            doc.add_page_break()
+    pdf.close()
+
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+def timed(func, *args, rounds=ROUNDS):
+    """Average duration of ``func(*args)`` over ``rounds`` calls, in seconds"""
+    start = time.perf_counter()
+    for _round in range(rounds):
+        func(*args)
+    return round((time.perf_counter() - start) / rounds, 3)
+
+
+def benchmark(env, rounds=ROUNDS):
+    from odoo.addons.bd_calling_billing_management.models.docx_converter import PDF2DOCX_OPTIONS
+
+    invoice = env['account.move'].search(
+        [('move_type', '=', 'out_invoice'), ('state', '=', 'posted')], order='id desc', limit=1)
+    if not invoice:
+        _logger.warning("DOCX benchmark: no posted customer invoice to render")
+        return {}
+
+    Converter = env['docx.pdf.converter']
+    Report = env['ir.actions.report']
+    results = {}
+    for pdf_xmlid, docx_xmlid in INVOICE_REPORTS.items():
+        report = env.ref(pdf_xmlid, raise_if_not_found=False)
+        if not report:
+            continue
+        pdf_content, _content_type = Report._render_qweb_pdf(report, invoice.ids)
+        timings = {
+            'legacy': timed(convert_legacy, pdf_content, PDF2DOCX_OPTIONS, rounds=rounds),
+            'in_memory': timed(Converter._convert_pdf_to_docx_uncached, pdf_content, rounds=rounds),
+        }
+        # Fill the cache once, then time the hits
+        Converter._convert_pdf_to_docx(pdf_content)
+        timings['cached'] = timed(Converter._convert_pdf_to_docx, pdf_content, rounds=rounds)
+
+        native_report = docx_xmlid and env.ref(docx_xmlid, raise_if_not_found=False)
+        if native_report:
+            timings['native'] = timed(Report._render, native_report, invoice.ids, rounds=rounds)
+        results[pdf_xmlid] = timings
+    return results
+
+
+if 'env' in globals():
+    for xmlid, timings in benchmark(env).items():
+        print(xmlid, timings)
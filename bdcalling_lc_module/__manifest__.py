@@ -1,6 +1,6 @@
 {
     'name': ' BdCalling LC Management',
-    'version': '1.0',
+    'version': '1.1',
     'summary': 'Letter of Credit Management for Purchase Orders',
     'description': """
         Automatically create Letter of Credit records from confirmed Purchase Orders.
@@ -0,0 +1,28 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Align the lc.order sequence with the LC00001 numbers already in use.
+
+    LC numbers used to be computed from the last LC record; they now come from
+    the ``seq_lc_order`` sequence, so it has to continue after the highest
+    existing number instead of restarting at LCO-0001.
+    """
+    cr.execute("""
+        SELECT COALESCE(MAX(SUBSTRING(name FROM '^LC([0-9]+)$')::integer), 0)
+          FROM lc_order
+    """)
+    last_number = cr.fetchone()[0]
+
+    cr.execute("""
+        UPDATE ir_sequence
+           SET prefix = 'LC',
+               padding = 5,
+               implementation = 'no_gap',
+               number_next = GREATEST(number_next, %s)
+         WHERE id = (SELECT res_id FROM ir_model_data
+                      WHERE module = 'bdcalling_lc_module' AND name = 'seq_lc_order')
+    """, [last_number + 1])
+    _logger.info(f"LC order sequence now continues after LC{last_number:05d}")
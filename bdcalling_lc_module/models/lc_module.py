@@ -12,6 +12,27 @@ class PurchaseOrder(models.Model):
     
     lc_order_id = fields.Many2one('lc.order', string='LC Reference', readonly=True)
     
+    # PO-to-LC coverage, kept up to date from the LC lines
+    lc_covered_amount = fields.Monetary(
+        string='LC Covered Amount',
+        currency_field='currency_id',
+        compute='_compute_lc_coverage',
+        store=True,
+    )
+    lc_coverage_percent = fields.Float(
+        string='LC Coverage (%)',
+        compute='_compute_lc_coverage',
+        store=True,
+        aggregator='avg',
+    )
+    
+    @api.depends('order_line.lc_covered_amount', 'amount_untaxed')
+    def _compute_lc_coverage(self):
+        for order in self:
+            covered = sum(order.order_line.mapped('lc_covered_amount'))
+            order.lc_covered_amount = covered
+            order.lc_coverage_percent = covered / order.amount_untaxed * 100 if order.amount_untaxed else 0.0
+    
     # def button_confirm(self):
     #     # First confirm the PO
     #     result = super().button_confirm()
@@ -41,6 +62,30 @@ class PurchaseOrder(models.Model):
         
     #     return result
 
+
+class PurchaseOrderLine(models.Model):
+    _inherit = 'purchase.order.line'
+    
+    lc_line_ids = fields.One2many('lc.order.line', 'po_line_id', string='LC Lines')
+    lc_covered_qty = fields.Float(
+        string='LC Covered Qty',
+        digits='Product Unit',
+        compute='_compute_lc_covered',
+        store=True,
+    )
+    lc_covered_amount = fields.Monetary(
+        string='LC Covered Amount',
+        currency_field='currency_id',
+        compute='_compute_lc_covered',
+        store=True,
+    )
+    
+    @api.depends('lc_line_ids.quantity', 'lc_line_ids.subtotal')
+    def _compute_lc_covered(self):
+        for line in self:
+            line.lc_covered_qty = sum(line.lc_line_ids.mapped('quantity'))
+            line.lc_covered_amount = sum(line.lc_line_ids.mapped('subtotal'))
+
 class LCOrder(models.Model):
     _name = 'lc.order'
     _description = 'Letter of Credit'
@@ -59,49 +104,30 @@ class LCOrder(models.Model):
     lc_line_ids = fields.One2many('lc.order.line', 'lc_order_id', string='Products')
     payment_terms = fields.Many2one('lc.payment.term', string='Payment Terms', tracking=True)
     payment_term_line_ids = fields.One2many('lc.payment.term.line', 'lc_order_id', string='Payment Term Lines')
-    # currency_id = fields.Many2one(
-    #     'res.currency',
-    #     string='Currency',
-    #     default=lambda self: self.env.company.currency_id,
-    #     required=True,
-    #     tracking=True
-    # )
-    
-    # active_currency_ids = fields.Many2many(
-    #     'res.currency',
-    #     compute='_compute_active_currencies',
-    #     string='Active Currencies',
-    #     store=False
-    # )
-    
-    # # Update amount fields to use currency
-    # total_amount = fields.Monetary(
-    #     string='Total Amount',
-    #     currency_field='currency_id',
-    #     compute='_compute_total_amount',
-    #     store=True
-    # )
-    
-    # @api.depends('vendor_id', 'po_number')
-    # def _compute_active_currencies(self):
-    #     """Get active currencies to show at top of dropdown"""
-    #     for record in self:
-    #         # Get all active currencies
-    #         active_currencies = self.env['res.currency'].search([
-    #             ('active', '=', True)
-    #         ], order='name')
-            
-    #         record.active_currency_ids = [(6, 0, active_currencies.ids)]
-    
-    # @api.depends('lc_line_ids.subtotal')
-    # def _compute_total_amount(self):
-    #     """Calculate total amount from LC lines"""
-    #     for record in self:
-    #         record.total_amount = sum(record.lc_line_ids.mapped('subtotal'))
+    currency_id = fields.Many2one(
+        'res.currency',
+        string='Currency',
+        compute='_compute_currency_id',
+        store=True,
+    )
+    total_amount = fields.Monetary(
+        string='Total Amount',
+        currency_field='currency_id',
+        compute='_compute_total_amount',
+        store=True,
+        tracking=True,
+    )
     
-   
+    @api.depends('po_number.currency_id')
+    def _compute_currency_id(self):
+        for record in self:
+            record.currency_id = record.po_number.currency_id or self.env.company.currency_id
     
-  
+    @api.depends('lc_line_ids.subtotal')
+    def _compute_total_amount(self):
+        """Calculate total amount from LC lines"""
+        for record in self:
+            record.total_amount = sum(record.lc_line_ids.mapped('subtotal'))
     
     @api.onchange('payment_terms')
     def _onchange_payment_terms(self):
@@ -155,54 +181,105 @@ class LCOrder(models.Model):
             
         result = super(LCOrder, self).write(vals)
         
-        # If PO is changed, regenerate lines
+        # If PO is changed, bring the lines in line with the new PO
         if 'po_number' in vals and vals['po_number']:
-            # Delete all existing lines
-            self.lc_line_ids.unlink()
-            
-            # Create new lines from PO
-            po = self.env['purchase.order'].browse(vals['po_number'])
-            for po_line in po.order_line:
-                if po_line.product_id and po_line.product_qty > 0:
-                    self.env['lc.order.line'].create({
-                        'lc_order_id': self.id,
-                        'product_id': po_line.product_id.id,
-                        'quantity': po_line.product_qty,
-                        'unit_price': po_line.price_unit,
-                        'po_line_id': po_line.id,
-                        'product_category_id': po_line.product_id.categ_id.id,
-                    })
+            self._sync_lc_lines_from_po()
         
         return result
     
     @api.model
+    def _prepare_lc_line_vals(self, po_line):
+        return {
+            'product_id': po_line.product_id.id,
+            'quantity': po_line.product_qty,
+            'unit_price': po_line.price_unit,
+            'po_line_id': po_line.id,
+            'product_category_id': po_line.product_id.categ_id.id,
+        }
+    
+    def _sync_lc_lines_from_po(self):
+        """Make the LC lines mirror the lines of their purchase order.
+
+        Existing lines are matched on ``po_line_id``: unchanged lines are left
+        alone, changed ones are updated, lines no longer on the PO are deleted
+        and all missing lines are inserted with a single batched create.
+        """
+        LCLine = self.env['lc.order.line']
+        # Load the PO lines and the current LC lines of the whole batch at once
+        self.po_number.order_line.fetch(['product_id', 'product_qty', 'price_unit'])
+        self.lc_line_ids.fetch(['product_id', 'quantity', 'unit_price', 'po_line_id', 'product_category_id'])
+        
+        vals_to_create = []
+        lines_to_delete = LCLine
+        for record in self:
+            existing = {line.po_line_id.id: line for line in record.lc_line_ids if line.po_line_id}
+            lines_to_delete |= record.lc_line_ids.filtered(lambda line: not line.po_line_id)
+            
+            for po_line in record.po_number.order_line:
+                # Only lines for products that exist and have quantity
+                if not po_line.product_id or po_line.product_qty <= 0:
+                    continue
+                line_vals = record._prepare_lc_line_vals(po_line)
+                line = existing.pop(po_line.id, None)
+                if not line:
+                    vals_to_create.append({**line_vals, 'lc_order_id': record.id})
+                    continue
+                changed = {
+                    name: value for name, value in line_vals.items()
+                    if line._fields[name].convert_to_write(line[name], line) != value
+                }
+                if changed:
+                    line.write(changed)
+            
+            # Lines whose PO line is gone (or belongs to the previous PO)
+            for line in existing.values():
+                lines_to_delete |= line
+        
+        if lines_to_delete:
+            lines_to_delete.unlink()
+        if vals_to_create:
+            LCLine.create(vals_to_create)
+    
+    def _reserve_lc_numbers(self, count):
+        """Reserve ``count`` consecutive LC numbers from the lc.order sequence.
+
+        The sequence row is locked until the end of the transaction, so
+        concurrent creates wait for each other instead of reusing a number,
+        and a multi-record create takes its whole range in one update.
+        """
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'lc.order'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            raise UserError("The LC Order sequence (code 'lc.order') is missing.")
+        
+        if sequence.implementation != 'no_gap':
+            return [sequence.next_by_id() for _i in range(count)]
+        
+        self.env.cr.execute(
+            "SELECT number_next, number_increment FROM ir_sequence WHERE id = %s FOR UPDATE",
+            [sequence.id],
+        )
+        number_next, increment = self.env.cr.fetchone()
+        self.env.cr.execute(
+            "UPDATE ir_sequence SET number_next = %s WHERE id = %s",
+            [number_next + count * increment, sequence.id],
+        )
+        sequence.invalidate_recordset(['number_next'])
+        return [sequence.get_next_char(number_next + i * increment) for i in range(count)]
+    
+    @api.model_create_multi
     def create(self, vals_list):
         """Create LC lines when creating new LC order"""
-        if isinstance(vals_list, dict):
-            vals_list = [vals_list]
+        # Generate sequence numbers for all new records at once
+        to_number = [vals for vals in vals_list if vals.get('name', 'New') == 'New']
+        if to_number:
+            for vals, name in zip(to_number, self._reserve_lc_numbers(len(to_number))):
+                vals['name'] = name
 
         records_to_create = []
         for vals in vals_list:
-            # Generate sequence number
-            if vals.get('name', 'New') == 'New':
-                # Search for previous LC records (not M/D/ records)
-                last_record = self.search([('name', 'like', 'LC%')], order='id desc', limit=1)
-                
-                if last_record and last_record.name:
-                    try:
-                        # Extract the numeric part from LC00001, LC00002, etc.
-                        # Remove "LC" prefix and get the number
-                        seq_str = last_record.name[2:]  # Remove first 2 chars "LC"
-                        last_seq = int(seq_str)
-                        next_seq = last_seq + 1
-                    except (ValueError, IndexError):
-                        next_seq = 1
-                else:
-                    next_seq = 1
-                
-                # Format with leading zeros (5 digits)
-                vals['name'] = f"LC{str(next_seq).zfill(5)}"
-            
             # Remove lc_line_ids from vals to prevent saving onchange lines
             if 'lc_line_ids' in vals:
                 vals.pop('lc_line_ids')
@@ -212,24 +289,8 @@ class LCOrder(models.Model):
         # Create the records
         records = super(LCOrder, self).create(records_to_create)
         
-        # Handle single record creation (for backward compatibility)
-        if isinstance(records, models.Model):
-            records = records
-        
         # Create LC lines from PO if specified
-        for record in records:
-            if record.po_number:
-                for po_line in record.po_number.order_line:
-                    # Only create lines for products that exist and have quantity
-                    if po_line.product_id and po_line.product_qty > 0:
-                        self.env['lc.order.line'].create({
-                            'lc_order_id': record.id,
-                            'product_id': po_line.product_id.id,
-                            'quantity': po_line.product_qty,
-                            'unit_price': po_line.price_unit,
-                            'po_line_id': po_line.id,
-                            'product_category_id': po_line.product_id.categ_id.id,
-                        })
+        records.filtered('po_number')._sync_lc_lines_from_po()
         
         return records
 class LCOrderLine(models.Model):
@@ -248,6 +309,19 @@ class LCOrderLine(models.Model):
         readonly=True
         
     )
+    currency_id = fields.Many2one(related='lc_order_id.currency_id', store=True)
+    subtotal = fields.Monetary(
+        string='Subtotal',
+        currency_field='currency_id',
+        compute='_compute_subtotal',
+        store=True,
+    )
+    
+    @api.depends('quantity', 'unit_price')
+    def _compute_subtotal(self):
+        for line in self:
+            line.subtotal = line.quantity * line.unit_price
+    
     @api.model_create_multi
     def create(self, vals_list):
         """Prevent creation of empty lines"""
@@ -0,0 +1,85 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from odoo import api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+from odoo.tests.common import BaseCase, get_db_name, tagged
+
+
+@contextmanager
+def environment():
+    """Environment on a real, independently committed cursor"""
+    with Registry(get_db_name()).cursor() as cr:
+        yield api.Environment(cr, SUPERUSER_ID, {'tracking_disable': True})
+
+
+def lc_number(name):
+    return int(name[len('LC'):])
+
+
+@tagged('post_install', '-at_install')
+class TestLCNumbering(BaseCase):
+    """LC numbers are drawn from the gapless lc.order sequence.
+
+    These tests need real concurrent transactions, so they run on their own
+    committed cursors and clean up the LCs and the sequence afterwards.
+    """
+
+    def setUp(self):
+        super().setUp()
+        with environment() as env:
+            sequence = env.ref('bdcalling_lc_module.seq_lc_order')
+            self.sequence_id = sequence.id
+            self.number_next = sequence.number_next
+        self.created_ids = []
+        self.addCleanup(self._cleanup)
+
+    def _cleanup(self):
+        with environment() as env:
+            env['lc.order'].browse(self.created_ids).exists().unlink()
+            env.cr.execute(
+                "UPDATE ir_sequence SET number_next = %s WHERE id = %s",
+                [self.number_next, self.sequence_id],
+            )
+
+    def test_concurrent_creates_get_distinct_consecutive_numbers(self):
+        barrier = threading.Barrier(2)
+        results = {}
+        errors = []
+
+        def create_lc(key):
+            try:
+                with environment() as env:
+                    barrier.wait(timeout=10)
+                    lc = env['lc.order'].create({})
+                    results[key] = (lc.id, lc.name)
+                    # Keep the sequence row locked while the other transaction
+                    # tries to draw its number
+                    time.sleep(0.5)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=create_lc, args=(key,)) for key in ('first', 'second')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        self.created_ids += [lc_id for lc_id, _name in results.values()]
+        self.assertFalse(errors)
+        names = sorted(name for _lc_id, name in results.values())
+        self.assertEqual(len(set(names)), 2, "Concurrent creates must not reuse an LC number")
+        self.assertEqual(lc_number(names[1]), lc_number(names[0]) + 1)
+        self.assertEqual(lc_number(names[0]), self.number_next)
+
+    def test_multi_create_reserves_contiguous_range(self):
+        with environment() as env:
+            lcs = env['lc.order'].create([{}, {}, {}])
+            self.created_ids += lcs.ids
+            names = lcs.mapped('name')
+            sequence = env['ir.sequence'].browse(self.sequence_id)
+            self.assertEqual(sequence.number_next, self.number_next + 3)
+
+        self.assertEqual([lc_number(name) for name in names], list(range(self.number_next, self.number_next + 3)))
+        self.assertTrue(all(name.startswith('LC') and len(name) == 7 for name in names))
@@ -6,7 +6,8 @@
     'summary': 'Add BD Calling product lines to Approval requests',
     'depends': ['approvals', 'product','base', 'stock','purchase'],
     'data': [
-        
+        'security/ir.model.access.csv',
+        'data/stock_snapshot_cron.xml',
         'views/approval_inherit_views.xml',
         'views/purchase_order_views.xml',
     ],
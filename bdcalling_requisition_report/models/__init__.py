@@ -1,2 +1,3 @@
 from . import approval_inherit
-from. import purchase_order_line
\ No newline at end of file
+from. import purchase_order_line
+from . import stock_snapshot
\ No newline at end of file
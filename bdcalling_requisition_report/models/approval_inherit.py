@@ -54,14 +54,37 @@ class ApprovalProductLine(models.Model):
             self.product_category_id = self.product_id.categ_id
     
     @api.depends('product_id')
+    @api.depends_context('warehouse_id', 'location', 'allowed_company_ids')
     def _compute_product_quantities(self):
-        """Compute incoming and outgoing quantities from product"""
+        """Compute incoming, outgoing and on-hand quantities for all lines at once"""
+        quantities = self._get_product_quantities()
         for line in self:
-            if line.product_id:
-                line.incoming_qty = line.product_id.incoming_qty
-                line.outgoing_qty = line.product_id.outgoing_qty
-                line.total_qty = line.product_id.qty_available
-            else:
-                line.incoming_qty = 0.0
-                line.outgoing_qty = 0.0
-                line.total_qty = 0.0
\ No newline at end of file
+            product_qty = quantities.get(line.product_id.id, {})
+            line.incoming_qty = product_qty.get('incoming_qty', 0.0)
+            line.outgoing_qty = product_qty.get('outgoing_qty', 0.0)
+            line.total_qty = product_qty.get('qty_available', 0.0)
+
+    def _get_product_quantities(self):
+        """Return the stock quantities of the lines' products, keyed by product id.
+
+        All products are computed together with one ``_compute_quantities_dict``
+        call. The usual stock context keys (``warehouse_id``, ``location``)
+        restrict the figures to a warehouse or location. Recent figures are
+        served from the stock snapshot cache.
+        """
+        products = self.product_id.filtered(lambda product: product.type != 'service')
+        if not products:
+            return {}
+        return self.env['approval.stock.snapshot']._get_quantities(products)
+
+
+class ApprovalRequest(models.Model):
+    _inherit = 'approval.request'
+
+    def action_refresh_stock_quantities(self):
+        """Drop the cached stock figures of the requested products and recompute them"""
+        lines = self.product_line_ids
+        Snapshot = self.env['approval.stock.snapshot']
+        Snapshot._invalidate(lines.product_id)
+        Snapshot._refresh(lines.product_id)
+        lines.invalidate_recordset(['incoming_qty', 'outgoing_qty', 'total_qty'])
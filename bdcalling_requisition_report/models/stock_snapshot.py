@@ -0,0 +1,216 @@
+import logging
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+STOCK_SNAPSHOT_TTL_PARAM = 'bdcalling_requisition_report.stock_snapshot_ttl'
+# Seconds a snapshot stays valid when the parameter is not set; stock move
+# state changes invalidate the figures of their products before that
+STOCK_SNAPSHOT_DEFAULT_TTL = 900
+# Requisitions whose product lines are kept warm by the refresh cron
+OPEN_REQUEST_STATUSES = ('new', 'pending')
+
+
+class ApprovalStockSnapshot(models.Model):
+    """Short-lived copy of the stock figures shown on requisition lines.
+
+    The quantities are stored per (product, allowed companies, warehouse,
+    location) by the refresh cron or the "Refresh Stock" button, and read
+    back until they expire or a stock move of the product changes state.
+    Reading never writes: missing figures are computed live.
+    """
+    _name = 'approval.stock.snapshot'
+    _description = 'Requisition Stock Snapshot'
+    _log_access = False
+
+    product_id = fields.Many2one('product.product', required=True, ondelete='cascade', index=True)
+    # Sorted ids of the companies the figures were computed for, e.g. "1,3"
+    company_key = fields.Char(required=True)
+    warehouse_id = fields.Many2one('stock.warehouse', ondelete='cascade')
+    location_id = fields.Many2one('stock.location', ondelete='cascade')
+    qty_available = fields.Float(digits='Product Unit')
+    incoming_qty = fields.Float(digits='Product Unit')
+    outgoing_qty = fields.Float(digits='Product Unit')
+    snapshot_date = fields.Datetime(required=True, index=True)
+
+    @api.model
+    def _get_ttl(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            STOCK_SNAPSHOT_TTL_PARAM, STOCK_SNAPSHOT_DEFAULT_TTL,
+        ))
+
+    @api.model
+    def _get_snapshot_key(self):
+        """Return the (companies, warehouse, location) scope of the current
+        environment, or None when it cannot be cached (e.g. a location given
+        by name or list)."""
+        warehouse = self.env.context.get('warehouse_id') or False
+        location = self.env.context.get('location') or False
+        if not isinstance(warehouse, (int, bool)) or not isinstance(location, (int, bool)):
+            return None
+        # Without a warehouse/location the figures cover every allowed company
+        company_key = ','.join(str(company_id) for company_id in sorted(self.env.companies.ids))
+        return company_key, warehouse, location
+
+    @api.model
+    def _get_quantities(self, products):
+        """Return ``{product_id: {'qty_available', 'incoming_qty', 'outgoing_qty'}}``.
+
+        Fresh snapshots are read back as is; the other products are computed
+        live with a single ``_compute_quantities_dict`` call, without storing
+        anything, so that opening a requisition stays a read-only request.
+        """
+        key = self._get_snapshot_key()
+        ttl = self._get_ttl()
+        if key is None or ttl <= 0:
+            return products._compute_quantities_dict(lot_id=None, owner_id=None, package_id=None)
+
+        company_key, warehouse_id, location_id = key
+        snapshots = self.sudo().search_fetch([
+            ('product_id', 'in', products.ids),
+            ('company_key', '=', company_key),
+            ('warehouse_id', '=', warehouse_id),
+            ('location_id', '=', location_id),
+            ('snapshot_date', '>=', fields.Datetime.subtract(fields.Datetime.now(), seconds=ttl)),
+        ], ['product_id', 'qty_available', 'incoming_qty', 'outgoing_qty'])
+
+        quantities = {
+            snapshot.product_id.id: {
+                'qty_available': snapshot.qty_available,
+                'incoming_qty': snapshot.incoming_qty,
+                'outgoing_qty': snapshot.outgoing_qty,
+            }
+            for snapshot in snapshots
+        }
+        missing = products.filtered(lambda product: product.id not in quantities)
+        if missing:
+            quantities.update(missing._compute_quantities_dict(lot_id=None, owner_id=None, package_id=None))
+        return quantities
+
+    @api.model
+    def _refresh(self, products):
+        """Recompute and store the snapshots of ``products`` for the current scope"""
+        key = self._get_snapshot_key()
+        products = products.filtered(lambda product: product.type != 'service')
+        if key is None or not products:
+            return
+        computed = products._compute_quantities_dict(lot_id=None, owner_id=None, package_id=None)
+        self._store_snapshots(computed, *key)
+
+    @api.model
+    def _store_snapshots(self, computed, company_key, warehouse_id, location_id):
+        Snapshot = self.sudo()
+        # Replace the rows of the same scope
+        Snapshot.search([
+            ('product_id', 'in', list(computed)),
+            ('company_key', '=', company_key),
+            ('warehouse_id', '=', warehouse_id),
+            ('location_id', '=', location_id),
+        ]).unlink()
+        now = fields.Datetime.now()
+        Snapshot.create([{
+            'product_id': product_id,
+            'company_key': company_key,
+            'warehouse_id': warehouse_id,
+            'location_id': location_id,
+            'qty_available': qty['qty_available'],
+            'incoming_qty': qty['incoming_qty'],
+            'outgoing_qty': qty['outgoing_qty'],
+            'snapshot_date': now,
+        } for product_id, qty in computed.items()])
+
+    @api.model
+    def _cron_refresh_snapshots(self):
+        """Refresh the missing or aging snapshots of the products on open requisitions.
+
+        Each requisition's company is covered; scopes created by users through
+        the refresh button (other company sets, warehouses or locations) are
+        kept up to date for those products as well. Snapshots younger than half
+        their TTL are left alone, so a run only recomputes the products whose
+        figures were invalidated or are about to expire.
+        """
+        lines = self.env['approval.product.line'].sudo().search([
+            ('approval_request_id.request_status', 'in', OPEN_REQUEST_STATUSES),
+            ('product_id', '!=', False),
+        ])
+        products_by_scope = defaultdict(set)
+        for line in lines:
+            scope = (str(line.approval_request_id.company_id.id or self.env.company.id), False, False)
+            products_by_scope[scope].add(line.product_id.id)
+
+        open_product_ids = set(lines.product_id.ids)
+        for company_key, warehouse, location in self.sudo()._read_group(
+            [('product_id', 'in', list(open_product_ids))],
+            ['company_key', 'warehouse_id', 'location_id'],
+        ):
+            products_by_scope[company_key, warehouse.id, location.id] |= open_product_ids
+
+        # Skip the snapshots that stay valid until the next runs
+        fresh_limit = fields.Datetime.subtract(fields.Datetime.now(), seconds=self._get_ttl() // 2)
+        fresh = self.sudo().search_fetch([
+            ('product_id', 'in', list(open_product_ids)),
+            ('snapshot_date', '>=', fresh_limit),
+        ], ['product_id', 'company_key', 'warehouse_id', 'location_id'])
+        for snapshot in fresh:
+            scope = (snapshot.company_key, snapshot.warehouse_id.id, snapshot.location_id.id)
+            products_by_scope[scope].discard(snapshot.product_id.id)
+
+        Product = self.env['product.product']
+        refreshed = 0
+        for (company_key, warehouse_id, location_id), product_ids in products_by_scope.items():
+            if not product_ids:
+                continue
+            company_ids = [int(company_id) for company_id in company_key.split(',')]
+            products = Product.with_company(company_ids[0]).with_context(
+                allowed_company_ids=company_ids,
+                warehouse_id=warehouse_id or None,
+                location=location_id or None,
+            ).browse(product_ids)
+            self.with_env(products.env)._refresh(products)
+            refreshed += len(product_ids)
+        _logger.info(f"Refreshed {refreshed} stock snapshots")
+
+    @api.model
+    def _invalidate(self, products):
+        """Forget the snapshots of ``products`` in every scope"""
+        if products:
+            self.sudo().search([('product_id', 'in', products.ids)]).unlink()
+
+    @api.model
+    def _invalidate_at_commit(self, products):
+        """Forget the snapshots of ``products`` once, when the transaction commits.
+
+        Stock moves change state many times per transaction; their products
+        are collected and the snapshots dropped with a single query.
+        """
+        if not products:
+            return
+        product_ids = self.env.cr.precommit.data.get(f'{self._name}.invalidate')
+        if product_ids is None:
+            product_ids = self.env.cr.precommit.data[f'{self._name}.invalidate'] = set()
+            self.env.cr.precommit.add(self._invalidate_pending)
+        product_ids.update(products.ids)
+
+    @api.model
+    def _invalidate_pending(self):
+        product_ids = self.env.cr.precommit.data.pop(f'{self._name}.invalidate', set())
+        self._invalidate(self.env['product.product'].browse(product_ids))
+
+    @api.autovacuum
+    def _gc_expired_snapshots(self):
+        """Remove snapshots that expired more than a day ago"""
+        limit = fields.Datetime.subtract(fields.Datetime.now(), days=1, seconds=self._get_ttl())
+        self.sudo().search([('snapshot_date', '<', limit)]).unlink()
+
+
+class StockMove(models.Model):
+    _inherit = 'stock.move'
+
+    def write(self, vals):
+        result = super().write(vals)
+        # Reserved, cancelled and done moves change the incoming/outgoing/on-hand figures
+        if 'state' in vals:
+            self.env['approval.stock.snapshot']._invalidate_at_commit(self.product_id)
+        return result
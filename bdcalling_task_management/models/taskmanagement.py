@@ -1,4 +1,9 @@
+from collections import Counter
+
 from odoo import models, fields, api
+from odoo.osv import expression
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
 
 class TaskManagement(models.Model):
     _name = "task.management"
@@ -67,6 +72,22 @@ class TaskManagement(models.Model):
         string="Warranty Type"
     )
 
+    # Denormalized text searched by the portal, backed by a trigram GIN index
+    search_document = fields.Text(
+        string="Search Document",
+        compute="_compute_search_document",
+        store=True,
+        index='trigram',
+    )
+
+    def init(self):
+        super().init()
+        # Portal task lists: one user's tasks of a team, newest visits first
+        create_index(
+            self.env.cr, 'task_management__portal_list_idx', self._table,
+            ['create_uid', 'task_team', 'visit_date DESC', 'id DESC'],
+        )
+
     # -----------------------------
     # FIX 1: Compute employee fields
     # -----------------------------
@@ -94,4 +115,59 @@ class TaskManagement(models.Model):
                 rec.job_position = rec.customer_id.function
             else:
                 rec.company_id = False
-                rec.job_position = False
\ No newline at end of file
+                rec.job_position = False
+
+    @api.depends('task_title', 'customer_id.name', 'company_id.name', 'remarks', 'analyzer', 'reagents')
+    def _compute_search_document(self):
+        for rec in self:
+            parts = [
+                rec.task_title, rec.customer_id.name, rec.company_id.name,
+                rec.remarks, rec.analyzer, rec.reagents,
+            ]
+            rec.search_document = ' '.join(part for part in parts if part) or False
+
+    @api.model
+    def _search_ranked(self, domain, term, limit=None, offset=0, order='visit_date desc, id desc'):
+        """Tasks matching ``domain`` whose search document contains ``term``.
+
+        Results are ranked by trigram word similarity between ``term`` and the
+        search document, then by ``order``.
+        """
+        term = (term or '').strip()
+        if not term:
+            return self.search(domain, limit=limit, offset=offset, order=order)
+
+        domain = expression.AND([domain, [('search_document', 'ilike', term)]])
+        query = self._search(domain, offset=offset, limit=limit, order=order)
+        if self.env.registry.has_trigram:
+            document_sql = self._field_to_sql(self._table, 'search_document', query)
+            query.order = SQL("word_similarity(%s, %s) DESC, %s", term, document_sql, query.order)
+        self.env.cr.execute(query.select(SQL.identifier(self._table, 'id')))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    # -----------------------------------
+    # Portal filter facets
+    # -----------------------------------
+    @api.model
+    def _get_task_facets(self, user_id, team):
+        """Distinct customers and purposes of a user's tasks, with task counts.
+
+        Computed with one grouped query served by the portal list index; returns
+        ``{'customers': [(id, count), ...], 'purposes': [(id, count), ...]}``.
+        """
+        groups = self.sudo()._read_group(
+            [('task_team', '=', team), ('create_uid', '=', user_id)],
+            ['customer_id', 'purpose_id'],
+            ['__count'],
+        )
+        customers = Counter()
+        purposes = Counter()
+        for customer, purpose, count in groups:
+            if customer:
+                customers[customer.id] += count
+            if purpose:
+                purposes[purpose.id] += count
+        return {
+            'customers': list(customers.items()),
+            'purposes': list(purposes.items()),
+        }
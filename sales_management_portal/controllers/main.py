@@ -4,84 +4,52 @@ from odoo import http
 from odoo.http import request
 from datetime import datetime, date
 from odoo.tools import DEFAULT_SERVER_DATE_FORMAT
-from odoo.addons.portal.controllers.portal import CustomerPortal
+from odoo.addons.portal.controllers.portal import CustomerPortal, pager as portal_pager
 
 _logger = logging.getLogger(__name__)
 
+CONTACTS_PER_PAGE = 20
+QUOTATIONS_PER_PAGE = 20
+TASK_CUSTOMERS_PER_PAGE = 20
+# Browser cache lifetime of the versioned country/state payload (one year)
+REFERENCE_DATA_MAX_AGE = 365 * 24 * 3600
+
+QUOTATION_SORTINGS = {
+    'name': {'label': 'Order Number', 'order': 'name desc, id desc'},
+    'date': {'label': 'Newest First', 'order': 'date_order desc, id desc'},
+    'amount': {'label': 'Highest Amount', 'order': 'amount_total desc, id desc'},
+    'customer': {'label': 'Customer', 'order': 'partner_id, id desc'},
+}
+
 class SalesPortalController(CustomerPortal):
     """Sales Management Portal Controller"""
 
     def _prepare_portal_layout_values(self):
-        """Override to add no_footer flag"""
+        """Override to add no_footer flag and the portal access flags"""
         values = super(SalesPortalController, self)._prepare_portal_layout_values()
         # Add flag to template to hide footer
         values['no_footer'] = True
+        values.update(self._get_portal_access_flags())
         return values
 
     def _has_portal_access(self, user, portal_field):
-        """Safely check if user has access to a portal field"""
-        try:
-            # Use hasattr first to check if field exists
-            if hasattr(user, portal_field):
-                return getattr(user, portal_field, False)
-            return False
-        except Exception as e:
-            _logger.warning(f"Error checking portal access {portal_field}: {str(e)}")
-            return False
+        """Check if user has access to a portal field, using the cached access context"""
+        return request.env['res.users']._get_portal_access_context(user.id).get(portal_field, False)
     
     def _check_portal_access(self, required_portal):
-        """Check if user has access to required portal"""
-        user = request.env.user
-        try:
-            # Check if portal field exists on user
-            if not hasattr(user, required_portal):
-                _logger.warning(f"Portal field {required_portal} not found on user")
-                return False
-            
-            # Get the field value safely
-            return getattr(user, required_portal, False)
-        except Exception as e:
-            _logger.error(f"Error checking portal access: {str(e)}")
-            return False
+        """Check if current user has access to required portal"""
+        return self._get_portal_access_flags().get(required_portal, False)
     
     def _get_portal_access_flags(self):
-        """Get all portal access flags safely"""
-        user = request.env.user
-        portal_fields = [
-            'use_contact_portal',
-            'use_sales_portal', 
-            'use_service_portal',
-            'use_quotation_portal'
-        ]
-        
-        portal_access = {}
-        for field in portal_fields:
-            portal_access[field] = self._has_portal_access(user, field)
-        
-        return portal_access
+        """Get all portal access flags of the current user"""
+        return dict(request.env['res.users']._get_portal_access_context(request.env.user.id))
 
     @http.route('/sales_management', type='http', auth='user', website=True)
     def sales_management_home(self, **kw):
         """Sales Management Dashboard Home"""
-        # Check if user has access to any portal - SAFE VERSION
-        user = request.env.user
-        
-        # Check each portal field safely
-        has_access = False
-        portal_fields = [
-            'use_contact_portal',
-            'use_sales_portal', 
-            'use_service_portal',
-            'use_quotation_portal'
-        ]
-        
-        for field in portal_fields:
-            try:
-                if hasattr(user, field) and getattr(user, field, False):
-                    has_access = True
-                    break
-            except Exception:
-                continue
+        # Check if user has access to any portal
+        portal_access = self._get_portal_access_flags()
+        has_access = any(portal_access.values())
         
         if not has_access:
             # Return access denied HTML page instead of redirecting to /web
@@ -206,15 +174,25 @@ class SalesPortalController(CustomerPortal):
             """
             return html
         
-        # Get portal access flags
-        portal_access = self._get_portal_access_flags()
-        values = self._prepare_portal_layout_values()  # This now includes no_footer
-        
-        # Merge dictionaries properly
-        all_values = {**portal_access, **values}
+        # Layout values include no_footer and the portal access flags
+        values = self._prepare_portal_layout_values()
         
-        return request.render('sales_management_portal.dashboard_main', all_values)
+        return request.render('sales_management_portal.dashboard_main', values)
     
+    def _get_task_filter_facets(self, team):
+        """Customers and purposes of the current user's tasks for the list filters, with task counts"""
+        facets = request.env['task.management']._get_task_facets(request.env.user.id, team)
+        customer_counts = dict(facets['customers'])
+        purpose_counts = dict(facets['purposes'])
+        customers = request.env['res.partner'].sudo().browse(customer_counts)
+        purposes = request.env['task.purpose'].sudo().browse(purpose_counts)
+        return {
+            'customers': customers.sorted(lambda partner: (partner.name or '').lower()),
+            'purposes': purposes.sorted(lambda purpose: (purpose.name or '').lower()),
+            'customer_counts': customer_counts,
+            'purpose_counts': purpose_counts,
+        }
+
     # --------------------------------------------------------------------
     # SALES PORTAL (ADVANCED FILTER VERSION)
     # --------------------------------------------------------------------
@@ -237,14 +215,6 @@ class SalesPortalController(CustomerPortal):
         ]
 
         search = kw.get('q', '').strip()
-        if search:
-            domain += [
-                '|', '|', '|',
-                ('task_title', 'ilike', search),
-                ('customer_id.name', 'ilike', search),
-                ('company_id.name', 'ilike', search),
-                ('remarks', 'ilike', search),
-            ]
 
         date_from = kw.get('date_from', '').strip()
         date_to = kw.get('date_to', '').strip()
@@ -263,21 +233,17 @@ class SalesPortalController(CustomerPortal):
             domain.append(('purpose_id', '=', int(purpose_id)))
 
         Task = request.env['task.management'].sudo()
-        tasks = Task.search(domain, limit=20, offset=(page - 1) * 20, order='visit_date desc, id desc')
+        # Search box matches the indexed search document, most relevant tasks first
+        tasks = Task._search_ranked(domain, search, limit=20, offset=(page - 1) * 20)
+        if search:
+            domain.append(('search_document', 'ilike', search))
         task_count = Task.search_count(domain)
 
-        customers = request.env['res.partner'].sudo().search([
-            ('id', 'in', Task.search([
-                ('task_team', '=', team),
-                ('create_uid', '=', request.env.user.id),
-            ]).mapped('customer_id').ids)
-        ])
-        purposes = request.env['task.purpose'].sudo().search([])
+        facets = self._get_task_filter_facets(team)
 
         message = kw.get('success') and "🎉 Your Sales Task has been submitted successfully!" or False
 
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         # Merge all values
@@ -291,12 +257,10 @@ class SalesPortalController(CustomerPortal):
             'date_to': date_to,
             'customer_id': customer_id,
             'purpose_id': purpose_id,
-            'customers': customers,
-            'purposes': purposes,
+            **facets,
             'message': message,
             'current_page': page,
             'total_pages': (task_count + 19) // 20,
-            **portal_access,
             **values,
         }
         
@@ -323,14 +287,6 @@ class SalesPortalController(CustomerPortal):
         ]
 
         search = kw.get('q', '').strip()
-        if search:
-            domain += [
-                '|', '|', '|',
-                ('task_title', 'ilike', search),
-                ('customer_id.name', 'ilike', search),
-                ('company_id.name', 'ilike', search),
-                ('remarks', 'ilike', search),
-            ]
 
         date_from = kw.get('date_from', '').strip()
         date_to = kw.get('date_to', '').strip()
@@ -349,22 +305,17 @@ class SalesPortalController(CustomerPortal):
             domain.append(('purpose_id', '=', int(purpose_id)))
 
         Task = request.env['task.management'].sudo()
-        tasks = Task.search(domain, limit=20, offset=(page - 1) * 20, order='visit_date desc, id desc')
+        # Search box matches the indexed search document, most relevant tasks first
+        tasks = Task._search_ranked(domain, search, limit=20, offset=(page - 1) * 20)
+        if search:
+            domain.append(('search_document', 'ilike', search))
         task_count = Task.search_count(domain)
 
-        customers = request.env['res.partner'].sudo().search([
-            ('id', 'in', Task.search([
-                ('task_team', '=', team),
-                ('create_uid', '=', request.env.user.id),
-            ]).mapped('customer_id').ids)
-        ])
-
-        purposes = request.env['task.purpose'].sudo().search([])
+        facets = self._get_task_filter_facets(team)
 
         message = kw.get('success') and "🎉 Your Service Task has been submitted successfully!" or False
 
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
@@ -377,12 +328,10 @@ class SalesPortalController(CustomerPortal):
             'date_to': date_to,
             'customer_id': customer_id,
             'purpose_id': purpose_id,
-            'customers': customers,
-            'purposes': purposes,
+            **facets,
             'message': message,
             'current_page': page,
             'total_pages': (task_count + 19) // 20,
-            **portal_access,
             **values,
         }
         
@@ -397,13 +346,11 @@ class SalesPortalController(CustomerPortal):
         if not task.exists() or task.create_uid.id != request.env.user.id:
             return request.redirect('/sales_management')
 
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'task': task,
-            **portal_access,
             **values,
         }
 
@@ -422,13 +369,11 @@ class SalesPortalController(CustomerPortal):
             if not task.exists() or task.create_uid.id != request.env.user.id:
                 return request.render('sales_management_portal.task_modal_view_template', {'task': False})
             
-            # Get portal access flags
-            portal_access = self._get_portal_access_flags()
+            # Layout values include the portal access flags
             values = self._prepare_portal_layout_values()
             
             all_values = {
                 'task': task,
-                **portal_access,
                 **values,
             }
             
@@ -461,25 +406,17 @@ class SalesPortalController(CustomerPortal):
             ('user_id', '=', request.env.user.id)
         ], limit=1)
         
-        # Get customers (persons only) with parent company info
-        customers = request.env['res.partner'].sudo().search([
-            ('is_company', '=', False)
-        ])
-        
         # Get purposes
         purposes = request.env['task.purpose'].sudo().search([])
 
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'team': team,
             'title': f'Create {team.capitalize()} Task',
             'current_employee': current_employee,
-            'customers': customers,
             'purposes': purposes,
-            **portal_access,
             **values,
         }
         
@@ -540,8 +477,27 @@ class SalesPortalController(CustomerPortal):
     
     ################Contact Portal########################
 
-    @http.route('/sales_management/contacts', type='http', auth='user', website=True)
-    def contacts_dashboard(self, **kw):
+    def _prepare_contacts_search_domain(self, search_term):
+        """Build a SQL-side domain matching the contact list search box"""
+        if not search_term:
+            return []
+        return [
+            '|', '|', '|', '|', '|',
+            ('complete_name', 'ilike', search_term),
+            ('email', 'ilike', search_term),
+            ('phone', 'ilike', search_term),
+            ('city', 'ilike', search_term),
+            ('state_id.name', 'ilike', search_term),
+            ('country_id.name', 'ilike', search_term),
+        ]
+
+    @http.route(
+        ['/sales_management/contacts', '/sales_management/contacts/page/<int:page>'],
+        type='http',
+        auth='user',
+        website=True,
+    )
+    def contacts_dashboard(self, page=1, **kw):
         """Contacts List View"""
         # Check portal access
         if not self._check_portal_access('use_contact_portal'):
@@ -561,20 +517,27 @@ class SalesPortalController(CustomerPortal):
             except (ValueError, Exception):
                 pass
         
-        # Get contacts with domain
-        contacts = request.env['res.partner'].sudo().search(domain)
+        # Handle search - pushed into the domain so filtering runs in SQL
+        search_term = kw.get('search', '').strip()
+        domain += self._prepare_contacts_search_domain(search_term)
         
-        # Handle search
-        search_term = kw.get('search', '')
-        if search_term:
-            contacts = contacts.filtered(lambda c: 
-                search_term.lower() in (c.complete_name or '').lower() or
-                search_term.lower() in (c.email or '').lower() or
-                search_term.lower() in (c.phone or '').lower() or
-                search_term.lower() in (c.city or '').lower() or
-                search_term.lower() in (c.state_id.name or '').lower() or
-                search_term.lower() in (c.country_id.name or '').lower()
-            )
+        # Count and fetch only the requested page
+        Partner = request.env['res.partner'].sudo()
+        contact_count = Partner.search_count(domain)
+        url_args = {key: value for key, value in (('search', search_term), ('user_filter', user_filter)) if value}
+        pager = portal_pager(
+            url='/sales_management/contacts',
+            url_args=url_args,
+            total=contact_count,
+            page=page,
+            step=CONTACTS_PER_PAGE,
+        )
+        contacts = Partner.search(
+            domain,
+            limit=CONTACTS_PER_PAGE,
+            offset=pager['offset'],
+            order='complete_name asc, id asc',
+        )
         
         # Get all active users for the filter dropdown
         sales_users = request.env['res.users'].sudo().search([
@@ -583,18 +546,19 @@ class SalesPortalController(CustomerPortal):
         
         message = kw.get('success') and "🎉 Your Contact has been created successfully!" or False
 
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include no_footer and the portal access flags
+        values = self._prepare_portal_layout_values()
         
         all_values = {
             'contacts': contacts,
+            'contact_count': contact_count,
+            'pager': pager,
             'search_term': search_term,
             'user_filter': user_filter,
             'selected_user': selected_user,
             'sales_users': sales_users,
             'message': message,
-            **portal_access,
-            'no_footer': True,
+            **values,
         }
         
         return request.render('sales_management_portal.contacts_list', all_values)
@@ -606,22 +570,47 @@ class SalesPortalController(CustomerPortal):
         if not self._check_portal_access('use_contact_portal'):
             return request.redirect('/sales_management')
         
-        countries = request.env['res.country'].sudo().search([])
-        states = request.env['res.country.state'].sudo().search([])
+        # Countries and states are loaded by the form from the versioned JSON payload
+        version = request.env['res.country']._get_portal_reference_version()
         
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
-            'countries': countries,
-            'states': states,
-            **portal_access,
+            'reference_data_url': f'/sales_management/reference/countries/{version}',
             **values,
         }
         
         return request.render('sales_management_portal.contact_form', all_values)
 
+    @http.route([
+        '/sales_management/reference/countries',
+        '/sales_management/reference/countries/<string:version>',
+    ], type='http', auth='user', methods=['GET'])
+    def country_reference_data(self, version=None, **kw):
+        """Countries and states as one JSON payload, cached by the browser.
+
+        The versioned URL never changes content, so it is cached for a year;
+        the unversioned one is revalidated through its ETag.
+        """
+        Country = request.env['res.country']
+        current_version = Country._get_portal_reference_version()
+        etag = f'"{current_version}"'
+        if version == current_version:
+            cache_control = f'private, max-age={REFERENCE_DATA_MAX_AGE}, immutable'
+        else:
+            cache_control = 'private, no-cache'
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', cache_control),
+            ('ETag', etag),
+        ]
+        
+        # Revalidation only costs the version query
+        if request.httprequest.headers.get('If-None-Match') == etag:
+            return request.make_response('', headers=headers, status=304)
+        return request.make_response(Country._get_portal_reference_payload(current_version), headers=headers)
+
     @http.route('/sales_management/contacts/submit', type='http', auth='user', methods=['POST'], website=True, csrf=True)
     def submit_contact(self, **kw):
         """Handle contact form submission"""
@@ -750,14 +739,12 @@ class SalesPortalController(CustomerPortal):
                 # ('user_id', '=', request.env.user.id)
             ])
         
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'contact': contact,
             'child_contacts': child_contacts,
-            **portal_access,
             **values,
         }
         
@@ -776,13 +763,11 @@ class SalesPortalController(CustomerPortal):
         # if contact.user_id.id != request.env.user.id:
         #     return request.redirect('/sales_management/contacts')
         
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'contact': contact,
-            **portal_access,
             **values,
         }
         
@@ -818,12 +803,7 @@ class SalesPortalController(CustomerPortal):
         try:
             search_term = kw.get('search_term', '').strip()
             
-            domain = [('is_company', '=', True)]
-            
-            if search_term:
-                domain.append(('name', 'ilike', search_term))
-            
-            companies = request.env['res.partner'].sudo().search(domain, limit=20, order='name asc')
+            companies = request.env['sales.portal.typeahead'].sudo()._search_typeahead('companies', search_term)
             
             results = []
             for company in companies:
@@ -847,11 +827,7 @@ class SalesPortalController(CustomerPortal):
         try:
             search_term = kw.get('search_term', '').strip()
             
-            domain = []
-            if search_term:
-                domain.append(('name', 'ilike', search_term))
-            
-            tags = request.env['res.partner.category'].sudo().search(domain, limit=20, order='name asc')
+            tags = request.env['sales.portal.typeahead'].sudo()._search_typeahead('tags', search_term)
             
             results = []
             for tag in tags:
@@ -873,27 +849,22 @@ class SalesPortalController(CustomerPortal):
         try:
             search_term = kw.get('search_term', '').strip()
             
-            domain = []
-            
-            if search_term:
-                domain.append(('name', 'ilike', search_term))
+            customers = request.env['sales.portal.typeahead'].sudo()._search_typeahead('customers', search_term)
             
-            customers = request.env['res.partner'].sudo().search(domain, limit=20, order='name asc')
+            # Resolve all pricelists in one batch instead of per customer
+            pricelists = customers._get_portal_pricelists()
             
             results = []
             for customer in customers:
-                # Get pricelist info
-                pricelist_info = ''
-                if customer.property_product_pricelist:
-                    pricelist_info = customer.property_product_pricelist.name
+                pricelist = pricelists.get(customer.id)
                 
                 results.append({
                     'id': customer.id,
                     'name': customer.complete_name,
                     'email': customer.email or '',
                     'phone': customer.phone or '',
-                    'pricelist_id': customer.property_product_pricelist.id if customer.property_product_pricelist else False,
-                    'pricelist_name': pricelist_info,
+                    'pricelist_id': pricelist.id if pricelist else False,
+                    'pricelist_name': pricelist.name if pricelist else '',
                     'type': 'Customer'
                 })
             
@@ -905,6 +876,40 @@ class SalesPortalController(CustomerPortal):
             return {'items': [], 'error': str(e)}
     
 
+    @http.route('/sales_management/search/task_customers', type='json', auth='user', website=True, methods=['POST'])
+    def search_task_customers(self, **kw):
+        """Paged person search for the customer field of the create task form"""
+        try:
+            if not (self._check_portal_access('use_sales_portal') or self._check_portal_access('use_service_portal')):
+                return {'items': [], 'more': False, 'error': 'Access denied'}
+            
+            search_term = kw.get('search_term', '').strip()
+            page = max(int(kw.get('page') or 1), 1)
+            
+            # One extra record tells whether there is a next page
+            persons = request.env['sales.portal.typeahead'].sudo()._search_typeahead(
+                'persons', search_term, limit=TASK_CUSTOMERS_PER_PAGE + 1,
+                offset=(page - 1) * TASK_CUSTOMERS_PER_PAGE,
+            )
+            more = len(persons) > TASK_CUSTOMERS_PER_PAGE
+            persons = persons[:TASK_CUSTOMERS_PER_PAGE]
+            persons.fetch(['name', 'function', 'parent_id'])
+            
+            results = []
+            for person in persons:
+                company = person.parent_id.name or ''
+                results.append({
+                    'id': person.id,
+                    'text': f"{person.name} ({company})" if company else person.name,
+                    'function': person.function or '',
+                    'company': company,
+                })
+            return {'items': results, 'more': more}
+            
+        except Exception as e:
+            _logger.error(f"Error in task customer search: {str(e)}")
+            return {'items': [], 'more': False, 'error': str(e)}
+
     @http.route('/sales_management/search/products', type='json', auth='user', website=True, methods=['POST'])
     def search_products(self, **kw):
         """Search products for quotation portal - CORRECTED VERSION"""
@@ -914,12 +919,7 @@ class SalesPortalController(CustomerPortal):
             
             search_term = kw.get('search_term', '')
             
-            domain = [('sale_ok', '=', True)]
-            
-            if search_term:
-                domain.append(('name', 'ilike', search_term))
-            
-            products = request.env['product.template'].sudo().search(domain, limit=20)
+            products = request.env['sales.portal.typeahead'].sudo()._search_typeahead('products', search_term)
             
             _logger.info(f"Product search - Term: '{search_term}', Found: {len(products)}")
             
@@ -946,11 +946,7 @@ class SalesPortalController(CustomerPortal):
         try:
             search_term = kw.get('search_term', '').strip()
             
-            domain = []
-            if search_term:
-                domain.append(('name', 'ilike', search_term))
-            
-            categories = request.env['product.category'].sudo().search(domain, limit=20, order='name asc')
+            categories = request.env['sales.portal.typeahead'].sudo()._search_typeahead('categories', search_term)
             
             results = []
             for category in categories:
@@ -973,15 +969,12 @@ class SalesPortalController(CustomerPortal):
             search_term = kw.get('search_term', '').strip()
             category_id = kw.get('category_id', '').strip()
             
-            domain = [('sale_ok', '=', True)]
-            
+            domain = []
             if category_id and category_id.isdigit():
                 domain.append(('categ_id', '=', int(category_id)))
             
-            if search_term:
-                domain.append(('name', 'ilike', search_term))
-            
-            products = request.env['product.template'].sudo().search(domain, limit=20, order='name asc')
+            products = request.env['sales.portal.typeahead'].sudo()._search_typeahead(
+                'products', search_term, domain=domain)
             
             results = []
             for product in products:
@@ -1003,8 +996,13 @@ class SalesPortalController(CustomerPortal):
 
     ################Quotation Portal########################
 
-    @http.route('/sales_management/quotation', type='http', auth='user', website=True)
-    def quotation_portal(self, **kw):
+    @http.route(
+        ['/sales_management/quotation', '/sales_management/quotation/page/<int:page>'],
+        type='http',
+        auth='user',
+        website=True,
+    )
+    def quotation_portal(self, page=1, **kw):
         """Quotation Portal with list view"""
         if not self._check_portal_access('use_quotation_portal'):
             return request.redirect('/sales_management')
@@ -1014,7 +1012,7 @@ class SalesPortalController(CustomerPortal):
         domain = [('user_id', '=', user_id)]
         
         # Handle search
-        search_term = kw.get('search', '')
+        search_term = kw.get('search', '').strip()
         if search_term:
             domain.extend([
                 '|', '|',
@@ -1023,11 +1021,6 @@ class SalesPortalController(CustomerPortal):
                 ('state', 'ilike', search_term)
             ])
         
-        # Handle status filter
-        status_filter = kw.get('status_filter', '')
-        if status_filter:
-            domain.append(('state', '=', status_filter))
-        
         # Handle date range filter
         date_from = kw.get('date_from')
         date_to = kw.get('date_to')
@@ -1044,11 +1037,6 @@ class SalesPortalController(CustomerPortal):
             except ValueError:
                 pass
         
-        quotations = request.env['sale.order'].sudo().search(domain, order='name DESC')
-        
-        # Calculate total amount sum
-        total_amount_sum = sum(quotations.mapped('amount_total') or [0])
-        
         # Status choices for dropdown
         status_choices = [
             ('draft', 'Quotation'),
@@ -1057,13 +1045,66 @@ class SalesPortalController(CustomerPortal):
             ('cancel', 'Cancelled')
         ]
         
+        SaleOrder = request.env['sale.order'].sudo()
+        
+        # Per-state counts and totals in one grouped query (before the status filter)
+        state_counts = {}
+        state_totals = {}
+        for state, amount_total, count in SaleOrder._read_group(
+            domain, ['state'], ['amount_total:sum', '__count'],
+        ):
+            state_counts[state] = count
+            state_totals[state] = amount_total or 0.0
+        
+        # Handle status filter
+        status_filter = kw.get('status_filter', '')
+        if status_filter:
+            domain.append(('state', '=', status_filter))
+            quotation_count = state_counts.get(status_filter, 0)
+            total_amount_sum = state_totals.get(status_filter, 0.0)
+        else:
+            quotation_count = sum(state_counts.values())
+            total_amount_sum = sum(state_totals.values())
+        
+        # Handle sorting
+        sortby = kw.get('sortby', '')
+        if sortby not in QUOTATION_SORTINGS:
+            sortby = 'name'
+        
+        url_args = {
+            key: value for key, value in (
+                ('search', search_term),
+                ('status_filter', status_filter),
+                ('date_from', date_from),
+                ('date_to', date_to),
+                ('sortby', sortby if sortby != 'name' else ''),
+            ) if value
+        }
+        pager = portal_pager(
+            url='/sales_management/quotation',
+            url_args=url_args,
+            total=quotation_count,
+            page=page,
+            step=QUOTATIONS_PER_PAGE,
+        )
+        quotations = SaleOrder.search(
+            domain,
+            limit=QUOTATIONS_PER_PAGE,
+            offset=pager['offset'],
+            order=QUOTATION_SORTINGS[sortby]['order'],
+        )
+        
         message = kw.get('success') and "🎉 Your Quotation has been created successfully!" or False
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'quotations': quotations,
+            'quotation_count': quotation_count,
+            'state_counts': state_counts,
+            'pager': pager,
+            'sortby': sortby,
+            'sortings': QUOTATION_SORTINGS,
             'search_term': search_term,
             'status_filter': status_filter,
             'date_from': date_from,
@@ -1071,7 +1112,6 @@ class SalesPortalController(CustomerPortal):
             'total_amount_sum': total_amount_sum,
             'status_choices': status_choices,
             'message': message,
-            **portal_access,
             **values,
         }
         
@@ -1086,18 +1126,102 @@ class SalesPortalController(CustomerPortal):
         # Get today's date for the form
         today = date.today().strftime('%Y-%m-%d')
         
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'today': today,
-            **portal_access,
             **values,
         }
         
         return request.render('sales_management_portal.quotation_form', all_values)
 
+    def _parse_quotation_line_rows(self, kw):
+        """Read the product line columns posted by the quotation form.
+
+        Returns a list of dicts (one per non-empty product row) with the raw
+        product, quantity, price and category values.
+        """
+        form_data = request.httprequest.form
+        
+        # Get lists from form data
+        if hasattr(form_data, 'getlist'):
+            category_ids = form_data.getlist('category_id[]')
+            product_ids = form_data.getlist('product_id[]')
+            quantities = form_data.getlist('quantity[]')
+            price_units = form_data.getlist('price_unit[]')
+        else:
+            # Handle as regular dict - values are newline separated
+            category_ids = [cid.strip() for cid in (kw.get('category_id[]') or '').split('\n') if cid.strip()]
+            product_ids = [pid.strip() for pid in (kw.get('product_id[]') or '').split('\n') if pid.strip()]
+            quantities = [q.strip() for q in (kw.get('quantity[]') or '').split('\n') if q.strip()]
+            price_units = [p.strip() for p in (kw.get('price_unit[]') or '').split('\n') if p.strip()]
+        
+        rows = []
+        for i, product_id in enumerate(product_ids):
+            if not product_id or not product_id.strip():
+                continue
+            try:
+                rows.append({
+                    'index': i,
+                    'product_id': int(product_id.strip()),
+                    'quantity': float(quantities[i]) if i < len(quantities) else 1.0,
+                    'price_unit': float(price_units[i]) if i < len(price_units) else 0.0,
+                    'category_id': category_ids[i].strip() if i < len(category_ids) and category_ids[i] else '',
+                })
+            except (ValueError, TypeError) as e:
+                _logger.error(f"Error processing product line {i}: {str(e)}")
+        return rows
+
+    def _prepare_quotation_line_vals_list(self, quotation, rows):
+        """Build the sale.order.line values for all parsed rows at once.
+
+        Products are fetched in a single batch. A posted category is kept only
+        if it is the product's category or one of its parents; the pricelist
+        tax is applied by the sale.order.line create override.
+        """
+        products = request.env['product.template'].sudo().browse(
+            list({row['product_id'] for row in rows})
+        ).exists()
+        products.fetch(['name', 'uom_id', 'categ_id'])
+        products.categ_id.fetch(['parent_path'])
+        products_by_id = {product.id: product for product in products}
+        
+        vals_list = []
+        for row in rows:
+            product = products_by_id.get(row['product_id'])
+            if not product:
+                _logger.error(f"Product ID {row['product_id']} does not exist")
+                continue
+            variant = product.product_variant_id
+            if not variant:
+                _logger.error(f"Product ID {row['product_id']} has no active variant")
+                continue
+            
+            # Use the posted category if it matches the product, else the product's category
+            category_id = product.categ_id.id or None
+            if row['category_id'].isdigit():
+                posted_category_id = int(row['category_id'])
+                category_path_ids = [int(cid) for cid in (product.categ_id.parent_path or '').split('/') if cid]
+                if posted_category_id in category_path_ids:
+                    category_id = posted_category_id
+                else:
+                    _logger.warning(f"Category ID {posted_category_id} does not match product ID {product.id}")
+            
+            vals = {
+                'order_id': quotation.id,
+                'product_id': variant.id,
+                'product_uom_qty': row['quantity'],
+                'price_unit': row['price_unit'],
+                'product_uom_id': product.uom_id.id,
+                'name': product.name,
+                'customer_lead': 0.0,
+            }
+            if category_id:
+                vals['product_category_id'] = category_id
+            vals_list.append(vals)
+        return vals_list
+
     @http.route('/sales_management/quotation/submit', type='http', auth='user', methods=['POST'], website=True, csrf=True)
     def submit_quotation(self, **kw):
         """Handle quotation form submission - UPDATED WITH CATEGORY"""
@@ -1107,14 +1231,6 @@ class SalesPortalController(CustomerPortal):
             
             current_user_id = request.env.user.id
             
-            # Debug: Log all incoming data
-            _logger.info("Form submission data received:")
-            for key, value in kw.items():
-                if isinstance(value, list):
-                    _logger.info(f"{key}: {value}")
-                else:
-                    _logger.info(f"{key}: {value}")
-            
             # Validate required fields
             if not kw.get('partner_id'):
                 _logger.error("No partner_id provided")
@@ -1124,6 +1240,14 @@ class SalesPortalController(CustomerPortal):
                 _logger.error("No date_order provided")
                 return request.redirect('/sales_management/quotation/create?error=Please+select+a+date')
             
+            # Parse and validate all product rows before creating anything
+            rows = self._parse_quotation_line_rows(kw)
+            _logger.info(f"Products to add: {len(rows)} items")
+            
+            if not rows:
+                _logger.error("No products provided")
+                return request.redirect('/sales_management/quotation/create?error=Please+add+at+least+one+product')
+            
             # Create quotation
             quotation_data = {
                 'partner_id': int(kw.get('partner_id')),
@@ -1140,116 +1264,18 @@ class SalesPortalController(CustomerPortal):
             quotation = request.env['sale.order'].sudo().create(quotation_data)
             _logger.info(f"Quotation created with ID: {quotation.id}")
             
-            # Get form data directly from request object
-            form_data = request.httprequest.form
-            
-            # Debug form data structure
-            _logger.info(f"Form data: {dict(form_data)}")
-            
-            # Get lists from form data
-            if hasattr(form_data, 'getlist'):
-                category_ids = form_data.getlist('category_id[]')
-                product_ids = form_data.getlist('product_id[]')
-                quantities = form_data.getlist('quantity[]')
-                price_units = form_data.getlist('price_unit[]')
-            else:
-                # Handle as regular dict
-                category_ids_raw = kw.get('category_id[]', '')
-                product_ids_raw = kw.get('product_id[]', '')
-                quantities_raw = kw.get('quantity[]', '')
-                price_units_raw = kw.get('price_unit[]', '')
-                
-                # Split by newline to get list
-                category_ids = category_ids_raw.split('\n') if category_ids_raw else []
-                product_ids = product_ids_raw.split('\n') if product_ids_raw else []
-                quantities = quantities_raw.split('\n') if quantities_raw else []
-                price_units = price_units_raw.split('\n') if price_units_raw else []
-                
-                # Clean up empty strings
-                category_ids = [cid.strip() for cid in category_ids if cid.strip()]
-                product_ids = [pid.strip() for pid in product_ids if pid.strip()]
-                quantities = [q.strip() for q in quantities if q.strip()]
-                price_units = [p.strip() for p in price_units if p.strip()]
-            
-            _logger.info(f"Categories to add: {len(category_ids)} items")
-            _logger.info(f"Products to add: {len(product_ids)} items")
-            _logger.info(f"Category IDs: {category_ids}")
-            _logger.info(f"Product IDs: {product_ids}")
-            _logger.info(f"Quantities: {quantities}")
-            _logger.info(f"Price Units: {price_units}")
-            
-            if not product_ids or not any(product_ids):
-                _logger.error("No products provided")
-                quotation.unlink()
-                return request.redirect('/sales_management/quotation/create?error=Please+add+at+least+one+product')
-            
-            # Create order lines
-            order_lines_created = 0
-            for i in range(len(product_ids)):
-                if product_ids[i] and product_ids[i].strip():
-                    try:
-                        product_id = int(product_ids[i].strip())
-                        quantity = float(quantities[i]) if i < len(quantities) else 1.0
-                        price_unit = float(price_units[i]) if i < len(price_units) else 0.0
-                        
-                        # Get the product
-                        product = request.env['product.template'].sudo().browse(product_id)
-                        if not product.exists():
-                            _logger.error(f"Product ID {product_id} does not exist")
-                            continue
-                        
-                        # Get category for this product line
-                        category_id = None
-                        if i < len(category_ids) and category_ids[i] and category_ids[i].strip():
-                            try:
-                                category_id = int(category_ids[i].strip())
-                            except ValueError:
-                                # If category is invalid, use product's category
-                                category_id = product.categ_id.id if product.categ_id else None
-                        else:
-                            # Use product's category
-                            category_id = product.categ_id.id if product.categ_id else None
-                        
-                        # Prepare order line data
-                        order_line_data = {
-                            'order_id': quotation.id,
-                            'product_id': product_id,
-                            'product_uom_qty': quantity,
-                            'price_unit': price_unit,
-                            'product_uom_id': product.uom_id.id,
-                            'name': product.name,
-                            'customer_lead': 0.0,
-                        }
-                        
-                        # Add category if available
-                        if category_id:
-                            order_line_data['product_category_id'] = category_id
-                        
-                        _logger.info(f"Creating order line with data: {order_line_data}")
-                        
-                        # Create the order line
-                        order_line = request.env['sale.order.line'].sudo().create(order_line_data)
-                        order_lines_created += 1
-                        
-                        _logger.info(f"Order line created successfully: {order_line.id}")
-                        
-                    except (ValueError, TypeError) as e:
-                        _logger.error(f"Error processing product line {i}: {str(e)}")
-                        continue
-                    except Exception as e:
-                        _logger.error(f"Unexpected error creating order line {i}: {str(e)}")
-                        continue
-            
-            _logger.info(f"Total order lines created: {order_lines_created}")
-            
-            # Check if we created any order lines
-            if order_lines_created == 0:
+            # Create all order lines in a single batch
+            vals_list = self._prepare_quotation_line_vals_list(quotation, rows)
+            if not vals_list:
                 _logger.error("No order lines were created, deleting quotation")
                 quotation.unlink()
                 return request.redirect('/sales_management/quotation/create?error=No+valid+products+added')
             
-            # Update quotation amounts by triggering recomputation
-            quotation.write({})  # This will trigger recomputation of computed fields
+            order_lines = request.env['sale.order.line'].sudo().create(vals_list)
+            _logger.info(f"Total order lines created: {len(order_lines)}")
+            
+            # Flush once so amounts are recomputed for all lines together
+            quotation.flush_recordset()
             
             # Try to confirm the quotation
             try:
@@ -1278,13 +1304,11 @@ class SalesPortalController(CustomerPortal):
         if quotation.user_id.id != request.env.user.id:
             return request.redirect('/sales_management/quotation')
         
-        # Get portal access flags and layout values
-        portal_access = self._get_portal_access_flags()
+        # Layout values include the portal access flags
         values = self._prepare_portal_layout_values()
         
         all_values = {
             'quotation': quotation,
-            **portal_access,
             **values,
         }
         
@@ -1367,29 +1391,18 @@ class SalesPortalController(CustomerPortal):
             if not customer.exists():
                 return {'error': 'Customer not found'}
             
-            pricelist = customer.property_product_pricelist
+            summaries, default_pricelist_id = request.env['product.pricelist']._get_portal_pricelist_summaries()
+            pricelist = customer._get_portal_pricelists().get(customer.id)
             
-            if pricelist:
-                return {
-                    'pricelist_id': pricelist.id,
-                    'pricelist_name': pricelist.name,
-                    'currency_id': pricelist.currency_id.id if pricelist.currency_id else False,
-                    'currency_name': pricelist.currency_id.name if pricelist.currency_id else '',
-                    'currency_symbol': pricelist.currency_id.symbol if pricelist.currency_id else '',
-                }
-            else:
+            if pricelist and pricelist.id in summaries:
+                return self._prepare_pricelist_summary_values(summaries[pricelist.id])
+            elif default_pricelist_id:
                 # Get default pricelist
-                default_pricelist = request.env['product.pricelist'].sudo().search([], limit=1)
-                if default_pricelist:
-                    return {
-                        'pricelist_id': default_pricelist.id,
-                        'pricelist_name': default_pricelist.name + ' (Default)',
-                        'currency_id': default_pricelist.currency_id.id if default_pricelist.currency_id else False,
-                        'currency_name': default_pricelist.currency_id.name if default_pricelist.currency_id else '',
-                        'currency_symbol': default_pricelist.currency_id.symbol if default_pricelist.currency_id else '',
-                    }
-                else:
-                    return {'error': 'No pricelist found'}
+                values = self._prepare_pricelist_summary_values(summaries[default_pricelist_id])
+                values['pricelist_name'] += ' (Default)'
+                return values
+            else:
+                return {'error': 'No pricelist found'}
                     
         except Exception as e:
             _logger.error(f"Error getting customer pricelist: {str(e)}")
@@ -1397,6 +1410,27 @@ class SalesPortalController(CustomerPortal):
         
     
 
+    def _prepare_pricelist_summary_values(self, summary):
+        """Pricelist values returned to the quotation form, from a cached summary"""
+        return {
+            'pricelist_id': summary['pricelist_id'],
+            'pricelist_name': summary['pricelist_name'],
+            'currency_id': summary['currency_id'] or False,
+            'currency_name': summary['currency_name'],
+            'currency_symbol': summary['currency_symbol'],
+        }
+
+    def _prepare_pricelist_price_values(self, price, list_price):
+        """Price values returned to the quotation form for one product"""
+        return {
+            'price': price,
+            'formatted_price': "{:,.2f}".format(price),
+            'list_price': list_price,
+            'formatted_list_price': "{:,.2f}".format(list_price),
+            'has_discount': price < list_price,
+            'discount_percentage': ((list_price - price) / list_price * 100) if list_price > 0 else 0
+        }
+
     @http.route('/sales_management/quotation/get-product-price-pricelist', type='json', auth='user', website=True, methods=['POST'])
     def get_product_price_pricelist(self, **kw):
         """Get product price from pricelist"""
@@ -1422,26 +1456,67 @@ class SalesPortalController(CustomerPortal):
                 return {'price': 0, 'error': 'Pricelist not found'}
             
             # Get price from pricelist
-            price = pricelist._get_product_price(product, quantity)
-            list_price = product.list_price  # Regular price
-            
-            # Format price
+            price = pricelist._get_portal_prices([(product.id, quantity)])[product.id, quantity]
             currency = pricelist.currency_id
-            formatted_price = "{:,.2f}".format(price)
-            formatted_list_price = "{:,.2f}".format(list_price)
             
             return {
-                'price': price,
-                'formatted_price': formatted_price,
-                'list_price': list_price,
-                'formatted_list_price': formatted_list_price,
+                **self._prepare_pricelist_price_values(price, product.list_price),
                 'currency_id': currency.id,
                 'currency_name': currency.name,
                 'currency_symbol': currency.symbol,
-                'has_discount': price < list_price,
-                'discount_percentage': ((list_price - price) / list_price * 100) if list_price > 0 else 0
             }
             
         except Exception as e:
             _logger.error(f"Error getting product price from pricelist: {str(e)}")
-            return {'price': 0, 'error': str(e)}
\ No newline at end of file
+            return {'price': 0, 'error': str(e)}
+
+    @http.route('/sales_management/quotation/get-product-prices-pricelist', type='json', auth='user', website=True, methods=['POST'])
+    def get_product_prices_pricelist(self, **kw):
+        """Get the pricelist prices of several (product, quantity) lines in one call"""
+        try:
+            if not self._check_portal_access('use_quotation_portal'):
+                return {'prices': [], 'error': 'Access denied'}
+            
+            pricelist_id = kw.get('pricelist_id')
+            lines = kw.get('lines') or []
+            if not pricelist_id:
+                return {'prices': [], 'error': 'Missing parameters'}
+            
+            pricelist = request.env['product.pricelist'].sudo().browse(int(pricelist_id))
+            if not pricelist.exists():
+                return {'prices': [], 'error': 'Pricelist not found'}
+            
+            product_quantities = [
+                (int(line['product_id']), float(line.get('quantity') or 1))
+                for line in lines if line.get('product_id')
+            ]
+            products = request.env['product.template'].sudo().browse(
+                {product_id for product_id, _quantity in product_quantities}
+            ).exists()
+            products.fetch(['list_price'])
+            product_quantities = [
+                (product_id, quantity) for product_id, quantity in product_quantities
+                if product_id in products.ids
+            ]
+            prices = pricelist._get_portal_prices(product_quantities)
+            
+            currency = pricelist.currency_id
+            return {
+                'currency_id': currency.id,
+                'currency_name': currency.name,
+                'currency_symbol': currency.symbol,
+                'prices': [
+                    {
+                        'product_id': product_id,
+                        'quantity': quantity,
+                        **self._prepare_pricelist_price_values(
+                            prices[product_id, quantity], products.browse(product_id).list_price,
+                        ),
+                    }
+                    for product_id, quantity in product_quantities
+                ],
+            }
+            
+        except Exception as e:
+            _logger.error(f"Error getting product prices from pricelist: {str(e)}")
+            return {'prices': [], 'error': str(e)}
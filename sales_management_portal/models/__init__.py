@@ -1,2 +1,6 @@
 from . import res_user
-from . import contact_portal
\ No newline at end of file
+from . import contact_portal
+from . import product_pricelist
+from . import typeahead
+from . import res_country
+from . import sale_order
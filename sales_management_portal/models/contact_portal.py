@@ -1,7 +1,24 @@
 from odoo import models
+from odoo.tools.sql import create_index
+
 
 class ResPartner(models.Model):
     _inherit = 'res.partner'
-    
-    # No additional fields needed for now
-    pass
+
+    def init(self):
+        super().init()
+        # Contacts portal: partners of a salesperson, split by company/person
+        create_index(
+            self.env.cr, 'res_partner__portal_user_idx', self._table,
+            ['user_id', 'is_company', 'parent_id'],
+            where='user_id IS NOT NULL',
+        )
+
+    def _get_portal_pricelists(self):
+        """Resolve the pricelist of every partner in the recordset in one batch.
+
+        Goes through ``_get_partner_pricelist_multi`` for the whole recordset,
+        so the specific properties are read once and the company, country group
+        and default fallbacks are resolved once per country.
+        """
+        return self.env['product.pricelist']._get_partner_pricelist_multi(self.ids)
@@ -0,0 +1,72 @@
+from collections import defaultdict
+
+from odoo import models, api, tools
+
+
+class ProductPricelist(models.Model):
+    _inherit = 'product.pricelist'
+
+    @api.model
+    def _get_portal_pricelist_summaries(self):
+        """Summaries of the pricelists available in the current company.
+
+        Returns ``(summaries, default_pricelist_id)`` where ``summaries`` maps
+        each pricelist id to its name, currency and tax.
+        """
+        return self._get_portal_pricelist_summaries_cached(self._get_portal_pricelist_version())
+
+    @api.model
+    def _get_portal_pricelist_version(self):
+        """Row count and last write date of the pricelists and currencies.
+
+        Any create, write or unlink of either changes the version, so stale
+        summaries are never served and no cache has to be cleared.
+        """
+        self.env['product.pricelist'].flush_model(['write_date'])
+        self.env['res.currency'].flush_model(['write_date'])
+        self.env.cr.execute("""
+            SELECT (SELECT count(*) FROM product_pricelist),
+                   (SELECT max(write_date) FROM product_pricelist),
+                   (SELECT count(*) FROM res_currency),
+                   (SELECT max(write_date) FROM res_currency)
+        """)
+        return self.env.cr.fetchone()
+
+    @api.model
+    @tools.ormcache('self.env.company.id', 'self.env.lang', 'version')
+    def _get_portal_pricelist_summaries_cached(self, version):
+        pricelists = self.sudo().search([])
+        pricelists.currency_id.fetch(['name', 'symbol'])
+        has_tax = 'tax_id' in self._fields
+        summaries = {
+            pricelist.id: tools.frozendict({
+                'pricelist_id': pricelist.id,
+                'pricelist_name': pricelist.name,
+                'currency_id': pricelist.currency_id.id,
+                'currency_name': pricelist.currency_id.name or '',
+                'currency_symbol': pricelist.currency_id.symbol or '',
+                'tax_id': pricelist.tax_id.id if has_tax else False,
+            })
+            for pricelist in pricelists
+        }
+        return tools.frozendict(summaries), pricelists[:1].id
+
+    def _get_portal_prices(self, product_quantities):
+        """Price a list of ``(product.template id, quantity)`` pairs in one go.
+
+        Returns ``{(product_id, quantity): price}``; products are priced with one
+        ``_compute_price_rule`` call per distinct quantity, so the applicable
+        rules are searched once per quantity rather than once per product.
+        """
+        self.ensure_one()
+        template_ids_by_qty = defaultdict(set)
+        for product_id, quantity in product_quantities:
+            template_ids_by_qty[quantity].add(product_id)
+
+        Template = self.env['product.template']
+        prices = {}
+        for quantity, template_ids in template_ids_by_qty.items():
+            templates = Template.browse(template_ids)
+            for product_id, (price, _rule_id) in self._compute_price_rule(templates, quantity).items():
+                prices[product_id, quantity] = price
+        return prices
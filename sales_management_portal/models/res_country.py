@@ -0,0 +1,49 @@
+import hashlib
+import json
+
+from odoo import models, api, tools
+
+
+class ResCountry(models.Model):
+    _inherit = 'res.country'
+
+    @api.model
+    def _get_portal_reference_version(self):
+        """Version of the portal reference data, used as ETag and cache-busting key.
+
+        Derived from the row count and last write date of the countries and
+        states, and the language: any change to either table yields a new
+        version without clearing any cache.
+        """
+        self.env['res.country'].flush_model(['write_date'])
+        self.env['res.country.state'].flush_model(['write_date'])
+        self.env.cr.execute("""
+            SELECT (SELECT count(*) FROM res_country),
+                   (SELECT max(write_date) FROM res_country),
+                   (SELECT count(*) FROM res_country_state),
+                   (SELECT max(write_date) FROM res_country_state)
+        """)
+        key = repr((self.env.lang, *self.env.cr.fetchone()))
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    @api.model
+    def _get_portal_reference_data(self):
+        """Countries and their states for the portal address forms, as JSON.
+
+        Returns ``(version, payload)``, see ``_get_portal_reference_version``.
+        """
+        version = self._get_portal_reference_version()
+        return version, self._get_portal_reference_payload(version)
+
+    @api.model
+    @tools.ormcache('self.env.lang', 'version')
+    def _get_portal_reference_payload(self, version):
+        countries = self.sudo().search([])
+        states = self.env['res.country.state'].sudo().search([])
+        states_by_country = {}
+        for state in states:
+            states_by_country.setdefault(state.country_id.id, []).append([state.id, state.name])
+        return json.dumps({
+            'countries': [[country.id, country.name] for country in countries],
+            'states': states_by_country,
+        }, separators=(',', ':'))
@@ -1,4 +1,12 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+
+PORTAL_ACCESS_FIELDS = (
+    'use_contact_portal',
+    'use_sales_portal',
+    'use_service_portal',
+    'use_quotation_portal',
+)
+
 
 class ResUsers(models.Model):
     _inherit = 'res.users'
@@ -6,4 +14,22 @@ class ResUsers(models.Model):
     use_contact_portal = fields.Boolean(string='Access Contact Portal', default=False)
     use_quotation_portal = fields.Boolean(string='Access Quotation Portal', default=False)
     use_service_portal = fields.Boolean(string='Access Service Task', default=False)
-    use_sales_portal = fields.Boolean(string='Access Sales Task', default=False)
\ No newline at end of file
+    use_sales_portal = fields.Boolean(string='Access Sales Task', default=False)
+
+    @api.model
+    @tools.ormcache('user_id', cache='groups')
+    def _get_portal_access_context(self, user_id):
+        """Portal access flags of a user, read once and cached until they change.
+
+        Kept in the ``groups`` cache with the other per-user access data, so
+        changing the flags does not clear the default cache.
+        """
+        data = self.sudo().browse(user_id).read(list(PORTAL_ACCESS_FIELDS))
+        values = data[0] if data else {}
+        return tools.frozendict({field: bool(values.get(field)) for field in PORTAL_ACCESS_FIELDS})
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(field in vals for field in PORTAL_ACCESS_FIELDS):
+            self.env.registry.clear_cache('groups')
+        return res
@@ -0,0 +1,15 @@
+from odoo import models
+from odoo.tools.sql import create_index
+
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    def init(self):
+        super().init()
+        # Quotation portal: a salesperson's orders filtered by date range and state
+        create_index(
+            self.env.cr, 'sale_order__portal_user_date_state_idx', self._table,
+            ['user_id', 'date_order', 'state'],
+            where='user_id IS NOT NULL',
+        )
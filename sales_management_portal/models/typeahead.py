@@ -0,0 +1,129 @@
+import logging
+import time
+
+from odoo import models, api
+from odoo.osv import expression
+from odoo.tools import SQL, escape_psql
+from odoo.tools.sql import column_exists, index_exists
+
+_logger = logging.getLogger(__name__)
+
+# Latency budget for a single typeahead lookup, used by the benchmark helper
+TYPEAHEAD_P95_TARGET_MS = 100
+
+# Searchable sources for the portal dropdowns:
+# key -> (model, fields matched with ilike, field used for ranking, base domain)
+TYPEAHEAD_SOURCES = {
+    'companies': ('res.partner', ['complete_name', 'email', 'phone'], 'complete_name', [('is_company', '=', True)]),
+    'customers': ('res.partner', ['complete_name', 'email', 'phone'], 'complete_name', []),
+    'persons': ('res.partner', ['complete_name', 'email', 'phone'], 'complete_name', [('is_company', '=', False)]),
+    'products': ('product.template', ['name', 'default_code'], 'name', [('sale_ok', '=', True)]),
+    'categories': ('product.category', ['name'], 'name', []),
+    'tags': ('res.partner.category', ['name'], 'name', []),
+}
+
+# Plain text columns backed by a pg_trgm GIN index (table -> columns).
+# Translated columns such as product_template.name are jsonb and already get
+# a trigram index from the core field definition.
+TRIGRAM_INDEXES = {
+    'res_partner': ['name', 'complete_name', 'email', 'phone'],
+    'product_template': ['default_code'],
+    'product_product': ['default_code'],
+    'product_category': ['name'],
+}
+
+
+class SalesPortalTypeahead(models.AbstractModel):
+    _name = 'sales.portal.typeahead'
+    _description = 'Sales Portal Typeahead Search'
+
+    def init(self):
+        """Create the pg_trgm extension and the GIN indexes used by the portal searches"""
+        cr = self.env.cr
+        try:
+            with cr.savepoint():
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception as e:
+            _logger.warning("pg_trgm extension unavailable, typeahead searches will not be indexed: %s", e)
+            return
+
+        for table, columns in TRIGRAM_INDEXES.items():
+            for column in columns:
+                if not column_exists(cr, table, column):
+                    continue
+                index_name = f'{table}__{column}_portal_trgm_idx'
+                if index_exists(cr, index_name):
+                    continue
+                cr.execute(SQL(
+                    "CREATE INDEX %s ON %s USING gin (%s gin_trgm_ops)",
+                    SQL.identifier(index_name),
+                    SQL.identifier(table),
+                    SQL.identifier(column),
+                ))
+                _logger.info("Created trigram index %s", index_name)
+
+    @api.model
+    def _search_typeahead(self, source, term, domain=None, limit=20, offset=0):
+        """Return records of ``source`` matching ``term``, best matches first.
+
+        Matching runs with ilike on the configured fields (served by the
+        trigram indexes); results are ranked by prefix match on the ranking
+        field, then by trigram similarity, then alphabetically.
+        """
+        model_name, search_fields, rank_field, base_domain = TYPEAHEAD_SOURCES[source]
+        Model = self.env[model_name]
+        term = (term or '').strip()
+        domain = expression.AND([base_domain, domain or []])
+
+        if not term:
+            return Model.search(domain, limit=limit, offset=offset, order=f'{rank_field} asc, id asc')
+
+        domain = expression.AND([
+            domain,
+            expression.OR([[(field, 'ilike', term)] for field in search_fields]),
+        ])
+        query = Model._search(domain)
+        rank_sql = Model._field_to_sql(Model._table, rank_field, query)
+        id_sql = SQL.identifier(Model._table, 'id')
+        is_prefix = SQL("%s ILIKE %s", rank_sql, escape_psql(term) + '%')
+        if self.env.registry.has_trigram:
+            query.order = SQL(
+                "%s DESC, similarity(%s, %s) DESC, %s, %s",
+                is_prefix, rank_sql, term, rank_sql, id_sql,
+            )
+        else:
+            query.order = SQL("%s DESC, %s, %s", is_prefix, rank_sql, id_sql)
+        query.limit = limit
+        query.offset = offset
+
+        self.env.cr.execute(query.select(id_sql))
+        return Model.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _benchmark_typeahead(self, source, terms, rounds=20):
+        """Time typeahead lookups for ``terms`` and report p50/p95 in milliseconds.
+
+        Meant to be run from an Odoo shell against production-sized data, e.g.
+        ``env['sales.portal.typeahead']._benchmark_typeahead('customers', ['lab', 'dhaka'])``
+        """
+        timings = []
+        for _round in range(rounds):
+            for term in terms:
+                self.env.invalidate_all()
+                start = time.perf_counter()
+                self._search_typeahead(source, term)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        p50 = timings[len(timings) // 2]
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        result = {
+            'source': source,
+            'samples': len(timings),
+            'p50_ms': round(p50, 2),
+            'p95_ms': round(p95, 2),
+            'target_p95_ms': TYPEAHEAD_P95_TARGET_MS,
+            'within_target': p95 <= TYPEAHEAD_P95_TARGET_MS,
+        }
+        _logger.info("Typeahead benchmark: %s", result)
+        return result
@@ -0,0 +1,62 @@
+from odoo.tests.common import TransactionCase, new_test_user
+from odoo.tools import SQL
+
+
+class PortalIndexCase(TransactionCase):
+    """Base class of the portal list index tests.
+
+    Tables are seeded in bulk by cloning a template row in SQL, their planner
+    statistics refreshed with ANALYZE, and the list queries explained as the
+    ORM builds them. Planner settings are left untouched: a test only passes
+    if PostgreSQL prefers the index at the seeded volume.
+    """
+
+    # Rows cloned into each seeded table
+    seed_size = 20000
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = [
+            new_test_user(cls.env, login=f'portal_index_user_{index}', groups='base.group_user')
+            for index in range(20)
+        ]
+
+    @classmethod
+    def user_for_row(cls, row_number):
+        """SQL picking one of ``cls.users`` from a row number expression"""
+        return SQL("(%s::int[])[mod(%s, %s) + 1]", [user.id for user in cls.users], row_number, len(cls.users))
+
+    @classmethod
+    def clone_rows(cls, record, values):
+        """Insert ``seed_size`` copies of ``record`` and analyze its table.
+
+        ``values`` maps column names to SQL expressions of the row number
+        ``n`` (1 to ``seed_size``); the other columns are copied as is.
+        """
+        record.env.flush_all()
+        table = record._table
+        cls.env.cr.execute("""
+            SELECT column_name
+              FROM information_schema.columns
+             WHERE table_schema = current_schema()
+               AND table_name = %s
+               AND column_name != 'id'
+        """, [table])
+        columns = [row[0] for row in cls.env.cr.fetchall()]
+        cls.env.cr.execute(SQL(
+            "INSERT INTO %s (%s) SELECT %s FROM %s AS template, generate_series(1, %s) AS n WHERE template.id = %s",
+            SQL.identifier(table),
+            SQL(', ').join(SQL.identifier(column) for column in columns),
+            SQL(', ').join(values.get(column, SQL.identifier('template', column)) for column in columns),
+            SQL.identifier(table),
+            cls.seed_size,
+            record.id,
+        ))
+        cls.env.cr.execute(SQL("ANALYZE %s", SQL.identifier(table)))
+
+    def explain(self, model, domain, order, limit):
+        """Plan of the query the ORM runs for one page of a portal list"""
+        query = self.env[model]._search(domain, order=order, limit=limit)
+        self.env.cr.execute(SQL("EXPLAIN %s", query.select()))
+        return '\n'.join(row[0] for row in self.env.cr.fetchall())
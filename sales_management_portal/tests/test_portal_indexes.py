@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from unittest import SkipTest
+
+from odoo.tests.common import tagged
+from odoo.tools import SQL
+
+from odoo.addons.sales_management_portal.controllers.main import (
+    CONTACTS_PER_PAGE, QUOTATIONS_PER_PAGE, QUOTATION_SORTINGS,
+)
+from odoo.addons.sales_management_portal.tests.common import PortalIndexCase
+
+
+@tagged('post_install', '-at_install')
+class TestPortalIndexes(PortalIndexCase):
+    """The quotation and contact portal lists are served by their indexes"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        customer = cls.env['res.partner'].create({'name': 'Portal Index Customer'})
+        # One order per hour over the last ~2 years, spread over the salespeople and states
+        cls.clone_rows(cls.env['sale.order'].create({'partner_id': customer.id}), {
+            'user_id': cls.user_for_row(SQL('n')),
+            'date_order': SQL("(now() at time zone 'UTC') - n * interval '1 hour'"),
+            'state': SQL("(ARRAY['draft', 'sent', 'cancel'])[mod(n, 3) + 1]"),
+        })
+        # One contact in ten has a salesperson, as in a real contact book
+        cls.clone_rows(customer, {
+            'name': SQL("'Portal Index Contact ' || n"),
+            'complete_name': SQL("'Portal Index Contact ' || n"),
+            'user_id': SQL("CASE WHEN mod(n, 10) = 0 THEN %s END", cls.user_for_row(SQL('n / 10'))),
+        })
+
+    def test_quotation_list(self):
+        now = datetime.now()
+        plan = self.explain(
+            'sale.order',
+            [
+                ('user_id', '=', self.users[0].id),
+                ('date_order', '>=', now - timedelta(days=30)),
+                ('date_order', '<=', now),
+                ('state', '=', 'sent'),
+            ],
+            QUOTATION_SORTINGS['date']['order'],
+            QUOTATIONS_PER_PAGE,
+        )
+        self.assertIn('sale_order__portal_user_date_state_idx', plan)
+
+    def test_contact_list(self):
+        plan = self.explain(
+            'res.partner',
+            [('user_id', '=', self.users[0].id)],
+            'complete_name asc, id asc',
+            CONTACTS_PER_PAGE,
+        )
+        self.assertIn('res_partner__portal_user_idx', plan)
+
+
+@tagged('post_install', '-at_install')
+class TestTaskPortalIndexes(PortalIndexCase):
+    """The sales and service task lists are served by task_management__portal_list_idx"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if 'task.management' not in cls.env:
+            raise SkipTest("bdcalling_task_management is not installed")
+        template = cls.env['task.management'].create({'task_title': 'Visit', 'task_team': 'sales'})
+        cls.clone_rows(template, {
+            'task_title': SQL("'Visit ' || n"),
+            'task_team': SQL("CASE WHEN mod(n, 2) = 0 THEN 'sales' ELSE 'service' END"),
+            'create_uid': cls.user_for_row(SQL('n / 2')),
+            'visit_date': SQL("current_date - mod(n, 730)"),
+        })
+
+    def test_portal_task_list(self):
+        plan = self.explain(
+            'task.management',
+            [('task_team', '=', 'sales'), ('create_uid', '=', self.users[0].id)],
+            'visit_date desc, id desc',
+            20,
+        )
+        self.assertIn('task_management__portal_list_idx', plan)